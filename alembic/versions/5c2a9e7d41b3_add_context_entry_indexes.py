@@ -0,0 +1,28 @@
+"""Add context entry indexes
+
+Revision ID: 5c2a9e7d41b3
+Revises: 08b11f3f5013
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2a9e7d41b3'
+down_revision: Union[str, None] = '08b11f3f5013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by create_tables() already have these indexes
+    op.create_index('ix_context_entries_created_at', 'context_entries', ['created_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_context_entries_context_type', 'context_entries', ['context_type'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_context_entries_context_type', table_name='context_entries', if_exists=True)
+    op.drop_index('ix_context_entries_created_at', table_name='context_entries', if_exists=True)
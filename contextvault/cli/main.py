@@ -6,10 +6,9 @@ The coolest CLI for giving your AI superpowers!
 """
 
 import sys
-import time
 import click
 from pathlib import Path
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.text import Text
 from rich.align import Align
@@ -26,8 +25,23 @@ from contextvault.cli.commands import (
 
 console = Console()
 
+_WELCOME_PANEL = Panel(
+    "[bold cyan]Welcome to Contextible![/bold cyan]\n\n"
+    "Type [bold]contextible --help[/bold] to see all available commands.\n"
+    "Quick start: [bold]contextible setup[/bold]",
+    title="Getting Started",
+    border_style="cyan",
+    box=box.ROUNDED
+)
+
+_BANNER_SHOWN = False
+
 def show_banner():
-    """Display an awesome animated banner"""
+    """Display the Contextible banner (once per process)"""
+    global _BANNER_SHOWN
+    if _BANNER_SHOWN:
+        return
+    _BANNER_SHOWN = True
 
     # ASCII art logo
     logo = r"""
@@ -44,23 +58,19 @@ def show_banner():
     # Create gradient colors for the logo
     colors = ["cyan", "bright_cyan", "bright_blue", "blue"]
 
-    # Animate the logo appearing
     lines = logo.strip().split('\n')
-    for i, line in enumerate(lines):
-        color = colors[i % len(colors)]
-        console.print(f"[{color}]{line}[/{color}]", highlight=False)
-        time.sleep(0.05)
-
-    # Print tagline with animation
-    time.sleep(0.1)
-    tagline_text = Text(tagline, style="bold magenta")
-    console.print(Align.center(tagline_text))
-
-    time.sleep(0.05)
-    version_text = Text(version, style="dim white")
-    console.print(Align.center(version_text))
-
-    console.print()
+    logo_lines = [
+        Text(line, style=colors[i % len(colors)])
+        for i, line in enumerate(lines)
+    ]
+
+    # Render the whole banner in a single write instead of line-by-line
+    console.print(Group(
+        *logo_lines,
+        Align.center(Text(tagline, style="bold magenta")),
+        Align.center(Text(version, style="dim white")),
+        Text(),
+    ), highlight=False)
 
 def show_quick_banner():
     """Display a quick version of the banner (for subcommands)"""
@@ -94,14 +104,7 @@ def cli(ctx, no_banner):
             show_banner()
 
         # Show help when run without arguments
-        console.print(Panel(
-            "[bold cyan]Welcome to Contextible![/bold cyan]\n\n"
-            "Type [bold]contextible --help[/bold] to see all available commands.\n"
-            "Quick start: [bold]contextible setup[/bold]",
-            title="Getting Started",
-            border_style="cyan",
-            box=box.ROUNDED
-        ))
+        console.print(_WELCOME_PANEL)
 
 # Add command groups
 cli.add_command(setup.setup)
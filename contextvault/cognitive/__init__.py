@@ -1,5 +1,25 @@
 """Cognitive architecture components for intelligent attention and memory management."""
 
-from .workspace import CognitiveWorkspace, MemoryBuffer, AttentionManager, cognitive_workspace
+import importlib
+from typing import Any
 
 __all__ = ["CognitiveWorkspace", "MemoryBuffer", "AttentionManager", "cognitive_workspace"]
+
+
+def __getattr__(name: str) -> Any:
+    """Load the workspace module on first attribute access.
+
+    The workspace pulls in the token counter, which probes for tokenizer
+    backends at import time, so ``import contextvault.cognitive`` stays cheap
+    until one of the exported names is actually used.
+    """
+    if name in __all__:
+        workspace = importlib.import_module(".workspace", __name__)
+        value = getattr(workspace, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
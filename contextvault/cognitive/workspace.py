@@ -4,19 +4,33 @@ Based on cognitive architecture research for managing unlimited context with foc
 """
 
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
-from collections import deque
+from collections import OrderedDict, deque
+from operator import attrgetter
+import heapq
 import math
 
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 from ..services.token_counter import token_counter
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# dataclass(slots=True) needs Python 3.10+; older versions keep a __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class MemoryItem:
     """Single item in a memory buffer."""
 
@@ -27,23 +41,27 @@ class MemoryItem:
     relevance_score: float = 0.0
     attention_weight: float = 0.0
     access_count: int = 0
-    last_accessed: datetime = field(default_factory=datetime.utcnow)
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    last_accessed: float = field(default_factory=time.time)  # Unix timestamp
+    created_at: float = field(default_factory=time.time)  # Unix timestamp
+
+    # Forgetting-curve strength and the access_count it was computed for
+    _strength: float = field(default=1.0, init=False, repr=False, compare=False)
+    _strength_count: int = field(default=-1, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Calculate tokens if not provided."""
         if self.tokens == 0 and self.content:
             tokenizer_type = self.metadata.get("tokenizer_type", "llama")
-            self.tokens = token_counter.count_tokens(self.content, tokenizer_type)
+            self.tokens = token_counter.get_counter(tokenizer_type)(self.content)
 
     def update_access(self):
         """Update access statistics."""
         self.access_count += 1
-        self.last_accessed = datetime.utcnow()
+        self.last_accessed = time.time()
 
     def get_age_minutes(self) -> float:
         """Get age in minutes."""
-        return (datetime.utcnow() - self.created_at).total_seconds() / 60
+        return (time.time() - self.created_at) / 60
 
     def get_recency_score(self, half_life_minutes: float = 60.0) -> float:
         """
@@ -69,13 +87,14 @@ class MemoryItem:
             Memory retention score (0-1)
         """
         if days_since_access is None:
-            time_delta = datetime.utcnow() - self.last_accessed
-            days_since_access = time_delta.total_seconds() / 86400
+            days_since_access = (time.time() - self.last_accessed) / 86400
 
         # Ebbinghaus forgetting curve: R = e^(-t/S)
-        # S = strength (based on access count)
-        strength = 1 + math.log(1 + self.access_count)
-        retention = math.exp(-days_since_access / strength)
+        # S = strength (based on access count, recomputed only when it changes)
+        if self._strength_count != self.access_count:
+            self._strength = 1.0 + math.log1p(self.access_count)
+            self._strength_count = self.access_count
+        retention = math.exp(-days_since_access / self._strength)
 
         return max(0.0, min(1.0, retention))  # Clamp to [0, 1]
 
@@ -87,6 +106,8 @@ class MemoryBuffer:
     Implements intelligent eviction strategies and priority management.
     """
 
+    _INITIAL_ROWS = 16
+
     def __init__(
         self,
         name: str,
@@ -108,14 +129,37 @@ class MemoryBuffer:
         self.tokenizer_type = tokenizer_type
         self.eviction_strategy = eviction_strategy
 
-        self.items: List[MemoryItem] = []
+        # Items keyed by ID; for "lru" the order doubles as recency order
+        self._items: "OrderedDict[str, MemoryItem]" = OrderedDict()
         self.current_tokens = 0
 
+        # Numeric fields used by eviction, mirrored into dense parallel arrays
+        # (row i describes self._row_ids[i]); kept in sync by add/get/remove
+        self._rows: Dict[str, int] = {}
+        self._row_ids: List[str] = []
+        self._last_access_ts = np.empty(self._INITIAL_ROWS, dtype=np.float64)
+        self._access_count = np.empty(self._INITIAL_ROWS, dtype=np.int32)
+        self._priority = np.empty(self._INITIAL_ROWS, dtype=np.float64)  # attention + relevance
+
+        # Token counting function, bound to the tokenizer on first use
+        self._counter: Optional[Callable[[str], int]] = None
+
+        # get_all_content results keyed by include_metadata; cleared on mutation
+        self._content_cache: Dict[bool, str] = {}
+
         logger.info(
             f"Initialized {name} buffer: max_tokens={self.max_tokens}, "
             f"strategy={eviction_strategy}"
         )
 
+    @property
+    def items(self) -> List[MemoryItem]:
+        """Items currently held by the buffer."""
+        return list(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
     def add(self, item: MemoryItem) -> bool:
         """
         Add item to buffer, evicting if necessary.
@@ -132,7 +176,7 @@ class MemoryBuffer:
 
         # Ensure tokens are calculated
         if item.tokens == 0:
-            item.tokens = token_counter.count_tokens(item.content, self.tokenizer_type)
+            item.tokens = self._count_tokens(item.content)
 
         # Check if item is too large for buffer
         if item.tokens > self.max_tokens:
@@ -142,45 +186,118 @@ class MemoryBuffer:
             )
             return False
 
+        # Re-adding an ID replaces the previous entry
+        if item.id in self._items:
+            self.remove(item.id)
+
         # Make space if needed
         space_needed = item.tokens
-        while self.current_tokens + space_needed > self.max_tokens and self.items:
+        while self.current_tokens + space_needed > self.max_tokens and self._items:
             self._evict_item()
 
         # Add item
-        self.items.append(item)
+        self._items[item.id] = item
+        self._append_row(item)
         self.current_tokens += item.tokens
+        self._content_cache.clear()
 
         logger.debug(
-            f"Added item {item.id} to {self.name}: "
-            f"{self.current_tokens}/{self.max_tokens} tokens used"
+            "Added item %s to %s: %d/%d tokens used",
+            item.id, self.name, self.current_tokens, self.max_tokens
         )
 
         return True
 
+    def add_many(self, items: List[MemoryItem]) -> List[MemoryItem]:
+        """
+        Add several items in order, tokenizing uncounted ones in one batch.
+
+        Args:
+            items: Memory items to add
+
+        Returns:
+            Items that could not be added (empty or larger than the buffer)
+        """
+        uncounted = [item for item in items if item and item.content and item.tokens == 0]
+        if uncounted:
+            counts = token_counter.count_tokens_batch(
+                [item.content for item in uncounted], self.tokenizer_type
+            )
+            for item, tokens in zip(uncounted, counts):
+                item.tokens = tokens
+
+        return [item for item in items if not self.add(item)]
+
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens with this buffer's tokenizer, resolving it once."""
+        if self._counter is None:
+            self._counter = token_counter.get_counter(self.tokenizer_type)
+        return self._counter(text)
+
     def get(self, item_id: str) -> Optional[MemoryItem]:
         """Get item by ID and update access statistics."""
-        for item in self.items:
-            if item.id == item_id:
-                item.update_access()
-                return item
-        return None
+        item = self._items.get(item_id)
+        if item is None:
+            return None
+
+        item.update_access()
+        self._write_row(self._rows[item_id], item)
+        if self.eviction_strategy == "lru":
+            self._items.move_to_end(item_id)
+            self._content_cache.clear()
+        return item
 
     def remove(self, item_id: str) -> bool:
         """Remove item by ID."""
-        for i, item in enumerate(self.items):
-            if item.id == item_id:
-                self.current_tokens -= item.tokens
-                self.items.pop(i)
-                logger.debug(f"Removed item {item_id} from {self.name}")
-                return True
-        return False
+        item = self._items.pop(item_id, None)
+        if item is None:
+            return False
+
+        self._delete_row(item_id)
+        self.current_tokens -= item.tokens
+        self._content_cache.clear()
+        logger.debug("Removed item %s from %s", item_id, self.name)
+        return True
 
     def clear(self):
         """Clear all items from buffer."""
-        self.items.clear()
+        self._items.clear()
+        self._rows.clear()
+        self._row_ids.clear()
+        self._content_cache.clear()
         self.current_tokens = 0
-        logger.debug(f"Cleared {self.name} buffer")
+        logger.debug("Cleared %s buffer", self.name)
+
+    def _write_row(self, row: int, item: MemoryItem):
+        """Copy item's eviction fields into the given array row."""
+        self._last_access_ts[row] = item.last_accessed
+        self._access_count[row] = item.access_count
+        self._priority[row] = item.attention_weight + item.relevance_score
+
+    def _append_row(self, item: MemoryItem):
+        """Add a row for item, growing the arrays when full."""
+        row = len(self._row_ids)
+        if row == len(self._last_access_ts):
+            capacity = 2 * row
+            self._last_access_ts = np.resize(self._last_access_ts, capacity)
+            self._access_count = np.resize(self._access_count, capacity)
+            self._priority = np.resize(self._priority, capacity)
+
+        self._rows[item.id] = row
+        self._row_ids.append(item.id)
+        self._write_row(row, item)
+
+    def _delete_row(self, item_id: str):
+        """Remove item's row by moving the last row into its slot."""
+        row = self._rows.pop(item_id)
+        last_id = self._row_ids.pop()
+        last = len(self._row_ids)
+        if row != last:
+            self._row_ids[row] = last_id
+            self._rows[last_id] = row
+            self._last_access_ts[row] = self._last_access_ts[last]
+            self._access_count[row] = self._access_count[last]
+            self._priority[row] = self._priority[last]
 
     def _evict_item(self) -> Optional[MemoryItem]:
         """
@@ -189,42 +306,38 @@ class MemoryBuffer:
         Returns:
             Evicted item or None
         """
-        if not self.items:
+        if not self._items:
             return None
 
         if self.eviction_strategy == "lru":
-            # Least Recently Used
-            evict_idx = min(
-                range(len(self.items)),
-                key=lambda i: self.items[i].last_accessed
-            )
+            # Least Recently Used - oldest entry sits at the front
+            _, evicted = self._items.popitem(last=False)
 
         elif self.eviction_strategy == "priority":
             # Lowest priority (attention_weight + relevance_score)
-            evict_idx = min(
-                range(len(self.items)),
-                key=lambda i: (
-                    self.items[i].attention_weight + self.items[i].relevance_score
-                )
-            )
+            row = int(np.argmin(self._priority[:len(self._row_ids)]))
+            evicted = self._items.pop(self._row_ids[row])
 
         elif self.eviction_strategy == "forgetting":
-            # Lowest forgetting curve score (most forgotten)
-            evict_idx = min(
-                range(len(self.items)),
-                key=lambda i: self.items[i].calculate_forgetting_curve()
-            )
+            # Lowest forgetting curve score (most forgotten). Retention
+            # e^(-t/S) is monotone in t/S, so compare t/S and skip the exp.
+            n = len(self._row_ids)
+            days_since_access = (time.time() - self._last_access_ts[:n]) / 86400.0
+            strength = 1.0 + np.log1p(self._access_count[:n])
+            row = int(np.argmax(days_since_access / strength))
+            evicted = self._items.pop(self._row_ids[row])
 
         else:
             # Default: FIFO
-            evict_idx = 0
+            _, evicted = self._items.popitem(last=False)
 
-        evicted = self.items.pop(evict_idx)
+        self._delete_row(evicted.id)
         self.current_tokens -= evicted.tokens
+        self._content_cache.clear()
 
         logger.debug(
-            f"Evicted item {evicted.id} from {self.name} "
-            f"(strategy={self.eviction_strategy})"
+            "Evicted item %s from %s (strategy=%s)",
+            evicted.id, self.name, self.eviction_strategy
         )
 
         return evicted
@@ -239,23 +352,28 @@ class MemoryBuffer:
         Returns:
             Combined content string
         """
-        if not self.items:
-            return ""
-
-        if include_metadata:
-            parts = []
-            for item in self.items:
-                meta_str = f"[{item.metadata.get('type', 'unknown')}]"
-                parts.append(f"{meta_str} {item.content}")
-            return "\n\n".join(parts)
+        cached = self._content_cache.get(include_metadata)
+        if cached is not None:
+            return cached
+
+        if not self._items:
+            content = ""
+        elif include_metadata:
+            content = "\n\n".join(
+                f"[{item.metadata.get('type', 'unknown')}] {item.content}"
+                for item in self._items.values()
+            )
         else:
-            return "\n\n".join(item.content for item in self.items)
+            content = "\n\n".join(item.content for item in self._items.values())
+
+        self._content_cache[include_metadata] = content
+        return content
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get buffer statistics."""
         return {
             "name": self.name,
-            "item_count": len(self.items),
+            "item_count": len(self._items),
             "current_tokens": self.current_tokens,
             "max_tokens": self.max_tokens,
             "utilization": round(self.current_tokens / self.max_tokens * 100, 2) if self.max_tokens > 0 else 0,
@@ -263,6 +381,73 @@ class MemoryBuffer:
         }
 
 
+_MISSING = object()
+
+
+def _count_context_matches(item_metadata: Dict[str, Any], context_items) -> int:
+    """Count query context (key, value) pairs that item metadata matches."""
+    return sum(1 for key, value in context_items if item_metadata.get(key, _MISSING) == value)
+
+
+# Below this many items the JIT kernel's thread startup outweighs its gains
+JIT_SCORING_MIN_ITEMS = 1024
+
+
+def _score_attention(
+    relevance: np.ndarray,
+    created_ts: np.ndarray,
+    last_ts: np.ndarray,
+    access: np.ndarray,
+    context_match: np.ndarray,
+    now_ts: float
+) -> np.ndarray:
+    """Combine per-item attention factors into weights in [0, 1]."""
+    # Recency boost (more recent = higher attention), 60 minute half-life
+    age_minutes = (now_ts - created_ts) / 60.0
+    recency = np.exp(-0.693 * age_minutes / 60.0)
+
+    # Access frequency boost (frequently accessed = important)
+    log_access = np.log1p(access)
+    frequency_score = log_access / 5.0  # Normalized
+
+    # Forgetting curve (well-remembered = higher attention)
+    days_since_access = (now_ts - last_ts) / 86400.0
+    retention = np.clip(np.exp(-days_since_access / (1.0 + log_access)), 0.0, 1.0)
+
+    # Base relevance plus weighted boosts, normalized to [0, 1]
+    return np.clip(
+        relevance
+        + recency * 0.3
+        + frequency_score * 0.2
+        + retention * 0.2
+        + context_match * 0.3,
+        0.0,
+        1.0,
+    )
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _score_attention_jit(relevance, created_ts, last_ts, access, context_match, now_ts):
+        """Fused single-pass version of _score_attention."""
+        weights = np.empty_like(relevance)
+        for i in prange(relevance.size):
+            recency = math.exp(-0.693 * ((now_ts - created_ts[i]) / 60.0) / 60.0)
+            log_access = math.log1p(access[i])
+            retention = math.exp(-((now_ts - last_ts[i]) / 86400.0) / (1.0 + log_access))
+            retention = min(1.0, max(0.0, retention))
+            weight = (
+                relevance[i]
+                + recency * 0.3
+                + (log_access / 5.0) * 0.2
+                + retention * 0.2
+                + context_match[i] * 0.3
+            )
+            weights[i] = min(1.0, max(0.0, weight))
+        return weights
+
+
 class AttentionManager:
     """
     Manages attention weights and priorities for memory items.
@@ -272,7 +457,10 @@ class AttentionManager:
 
     def __init__(self):
         """Initialize attention manager."""
+        # Sampled (timestamp, query_length, item_count, mean_weight) records
         self.attention_history: deque = deque(maxlen=100)
+        self._history_counter = 0
+        self._history_sampling = settings.attention_history_sampling
 
     def compute_attention_weights(
         self,
@@ -302,41 +490,42 @@ class AttentionManager:
             return []
 
         query_context = query_context or {}
-        weights = []
-
-        for item in items:
-            # Base weight from relevance score (if already computed)
-            weight = item.relevance_score
-
-            # Recency boost (more recent = higher attention)
-            recency = item.get_recency_score(half_life_minutes=60.0)
-            weight += recency * 0.3
-
-            # Access frequency boost (frequently accessed = important)
-            frequency_score = math.log(1 + item.access_count) / 5.0  # Normalized
-            weight += frequency_score * 0.2
-
-            # Forgetting curve (well-remembered = higher attention)
-            retention = item.calculate_forgetting_curve()
-            weight += retention * 0.2
-
-            # Context match (if metadata matches query context)
-            context_match = self._compute_context_match(item.metadata, query_context)
-            weight += context_match * 0.3
+        n = len(items)
+
+        # Snapshot the numeric fields once and score all items together
+        now_ts = time.time()
+        relevance = np.fromiter((item.relevance_score for item in items), dtype=np.float64, count=n)
+        created_ts = np.fromiter((item.created_at for item in items), dtype=np.float64, count=n)
+        last_ts = np.fromiter((item.last_accessed for item in items), dtype=np.float64, count=n)
+        access = np.fromiter((item.access_count for item in items), dtype=np.float64, count=n)
+        if query_context:
+            context_items = tuple(query_context.items())
+            context_match = np.fromiter(
+                (_count_context_matches(item.metadata, context_items) for item in items),
+                dtype=np.float64,
+                count=n,
+            ) / len(context_items)
+        else:
+            context_match = np.full(n, 0.5)  # Neutral score
 
-            # Normalize to [0, 1]
-            weight = max(0.0, min(1.0, weight))
-            weights.append(weight)
+        if NUMBA_AVAILABLE and n >= JIT_SCORING_MIN_ITEMS:
+            weights = _score_attention_jit(
+                relevance, created_ts, last_ts, access, context_match, now_ts
+            )
+        else:
+            weights = _score_attention(
+                relevance, created_ts, last_ts, access, context_match, now_ts
+            )
 
-        # Log attention computation
-        self.attention_history.append({
-            "timestamp": datetime.utcnow(),
-            "query": query[:100],
-            "item_count": len(items),
-            "mean_weight": sum(weights) / len(weights) if weights else 0,
-        })
+        # Log every Nth attention computation for diagnostics
+        sampling = self._history_sampling
+        if sampling > 0 and self._history_counter % sampling == 0:
+            self.attention_history.append(
+                (time.time(), len(query), n, float(weights.mean()))
+            )
+        self._history_counter += 1
 
-        return weights
+        return weights.tolist()
 
     def _compute_context_match(
         self,
@@ -356,15 +545,7 @@ class AttentionManager:
         if not query_context:
             return 0.5  # Neutral score
 
-        matches = 0
-        total = 0
-
-        for key, value in query_context.items():
-            total += 1
-            if key in item_metadata and item_metadata[key] == value:
-                matches += 1
-
-        return matches / total if total > 0 else 0.5
+        return _count_context_matches(item_metadata, query_context.items()) / len(query_context)
 
     def prioritize_items(
         self,
@@ -384,14 +565,15 @@ class AttentionManager:
             Sorted list of items (highest attention first)
         """
         # Filter by minimum weight
-        filtered = [item for item in items if item.attention_weight >= min_weight]
+        filtered = (item for item in items if item.attention_weight >= min_weight)
+        by_weight = attrgetter("attention_weight")
+
+        # Partial selection beats a full sort when only a few items are wanted
+        if max_items and max_items < len(items) // 4:
+            return heapq.nlargest(max_items, filtered, key=by_weight)
 
         # Sort by attention weight (descending)
-        sorted_items = sorted(
-            filtered,
-            key=lambda x: x.attention_weight,
-            reverse=True
-        )
+        sorted_items = sorted(filtered, key=by_weight, reverse=True)
 
         # Limit to max_items
         if max_items:
@@ -489,13 +671,19 @@ class CognitiveWorkspace:
         # Clear scratchpad for new query
         self.scratchpad.clear()
 
+        # Tokenize the query and all memory contents in one batch
+        contents = [mem.get("content", "") for mem in relevant_memories]
+        token_counts = token_counter.count_tokens_batch([query] + contents, self.tokenizer_type)
+        query_tokens = token_counts[0]
+
         # Convert memories to MemoryItems
         memory_items = []
-        for mem in relevant_memories:
+        for mem, content, tokens in zip(relevant_memories, contents, token_counts[1:]):
             item = MemoryItem(
                 id=mem.get("id", str(len(memory_items))),
-                content=mem.get("content", ""),
+                content=content,
                 metadata=mem.get("metadata", {}),
+                tokens=tokens,
                 relevance_score=mem.get("relevance_score", 0.5),
             )
             memory_items.append(item)
@@ -518,7 +706,7 @@ class CognitiveWorkspace:
         # Gather statistics
         stats = {
             "query_length": len(query),
-            "query_tokens": token_counter.count_tokens(query, self.tokenizer_type),
+            "query_tokens": query_tokens,
             "memories_processed": len(memory_items),
             "scratchpad": self.scratchpad.get_statistics(),
             "task_buffer": self.task_buffer.get_statistics(),
@@ -567,23 +755,30 @@ class CognitiveWorkspace:
         # Sort items by attention weight
         sorted_items = sorted(items, key=lambda x: x.attention_weight, reverse=True)
 
-        # Distribute based on attention weights
+        # Partition into attention tiers in a single pass
+        high, medium, low = [], [], []
         for item in sorted_items:
             if item.attention_weight > 0.7:
-                # High attention → Scratchpad
-                if not self.scratchpad.add(item):
-                    # If scratchpad full, try task buffer
-                    self.task_buffer.add(item)
-
+                high.append(item)
             elif item.attention_weight > 0.3:
-                # Medium attention → Task buffer
-                if not self.task_buffer.add(item):
-                    # If task buffer full, add to episodic cache
-                    self.episodic_cache.add(item)
-
+                medium.append(item)
             else:
-                # Low attention → Episodic cache
-                self.episodic_cache.add(item)
+                low.append(item)
+
+        # High attention → Scratchpad, filled in attention order up to its free
+        # space. The rest spills to the task buffer rather than evicting the
+        # higher-attention items already placed.
+        free_tokens = self.scratchpad.max_tokens - self.scratchpad.current_tokens
+        cutoff = int(np.searchsorted(
+            np.cumsum([item.tokens for item in high]), free_tokens, side="right"
+        ))
+        self.task_buffer.add_many(self.scratchpad.add_many(high[:cutoff]) + high[cutoff:])
+
+        # Medium attention → Task buffer (items it can't hold go to episodic cache)
+        medium_rejected = self.task_buffer.add_many(medium)
+
+        # Low attention → Episodic cache
+        self.episodic_cache.add_many(medium_rejected + low)
 
     def _build_context_string(self) -> str:
         """
@@ -627,9 +822,9 @@ class CognitiveWorkspace:
                 self.episodic_cache.current_tokens
             ),
             "total_items": (
-                len(self.scratchpad.items) +
-                len(self.task_buffer.items) +
-                len(self.episodic_cache.items)
+                len(self.scratchpad) +
+                len(self.task_buffer) +
+                len(self.episodic_cache)
             ),
         }
 
@@ -663,9 +858,10 @@ class CognitiveWorkspace:
 
 
 # Global cognitive workspace instance
+_max_context_tokens = settings.max_context_tokens
 cognitive_workspace = CognitiveWorkspace(
-    scratchpad_tokens=settings.max_context_tokens // 16,  # 8K default
-    task_buffer_tokens=settings.max_context_tokens // 2,  # 64K default
-    episodic_cache_tokens=settings.max_context_tokens * 2,  # 256K default
+    scratchpad_tokens=_max_context_tokens // 16,  # 8K default
+    task_buffer_tokens=_max_context_tokens // 2,  # 64K default
+    episodic_cache_tokens=_max_context_tokens * 2,  # 256K default
     tokenizer_type=settings.default_tokenizer_type
 )
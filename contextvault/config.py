@@ -1,7 +1,9 @@
 """Configuration management for ContextVault."""
 
-import os
-from typing import Any, Dict, List, Optional
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -39,17 +41,13 @@ class Settings(BaseSettings):
 
     # Graph RAG Configuration (Production Default: ENABLED)
     enable_graph_rag: bool = Field(default=True, env="ENABLE_GRAPH_RAG")
-    neo4j_uri: str = Field(default="bolt://localhost:7687", env="NEO4J_URI")
-    neo4j_user: str = Field(default="neo4j", env="NEO4J_USER")
-    neo4j_password: str = Field(default="password", env="NEO4J_PASSWORD")
 
     # Cognitive Workspace Configuration (Production Default: ENABLED - no external deps)
     enable_cognitive_workspace: bool = Field(default=True, env="ENABLE_COGNITIVE_WORKSPACE")
+    attention_history_sampling: int = Field(default=10, env="ATTENTION_HISTORY_SAMPLING")  # Record every Nth scoring pass, 0 disables
     
     # Mem0 Cognitive Workspace Configuration (Production Default: DISABLED - requires Qdrant)
     enable_mem0: bool = Field(default=False, env="ENABLE_MEM0")
-    qdrant_url: str = Field(default="http://localhost:6333", env="QDRANT_URL")
-    qdrant_api_key: Optional[str] = Field(default=None, env="QDRANT_API_KEY")
 
     # Token window management
     use_token_counting: bool = Field(default=True, env="USE_TOKEN_COUNTING")
@@ -65,33 +63,144 @@ class Settings(BaseSettings):
 
     # Extended Thinking Configuration
     enable_extended_thinking: bool = Field(default=True, env="ENABLE_EXTENDED_THINKING")
-    max_thinking_duration_minutes: int = Field(default=120, env="MAX_THINKING_DURATION_MINUTES")
-    synthesis_interval_seconds: int = Field(default=300, env="SYNTHESIS_INTERVAL_SECONDS")
-    max_concurrent_thinking_sessions: int = Field(default=5, env="MAX_CONCURRENT_THINKING_SESSIONS")
 
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = False
+        # .env is shared with the subsystem settings classes below
+        extra = "ignore"
+
+    # Subsystem settings are loaded on first access, see get_graph_settings() etc.
+    @property
+    def neo4j_uri(self) -> str:
+        return get_graph_settings().neo4j_uri
+
+    @property
+    def neo4j_user(self) -> str:
+        return get_graph_settings().neo4j_user
+
+    @property
+    def neo4j_password(self) -> str:
+        return get_graph_settings().neo4j_password
+
+    @property
+    def qdrant_url(self) -> str:
+        return get_mem0_settings().qdrant_url
+
+    @property
+    def qdrant_api_key(self) -> Optional[str]:
+        return get_mem0_settings().qdrant_api_key
+
+    @property
+    def max_thinking_duration_minutes(self) -> int:
+        return get_thinking_settings().max_thinking_duration_minutes
+
+    @property
+    def synthesis_interval_seconds(self) -> int:
+        return get_thinking_settings().synthesis_interval_seconds
+
+    @property
+    def max_concurrent_thinking_sessions(self) -> int:
+        return get_thinking_settings().max_concurrent_thinking_sessions
+
+
+class GraphRAGSettings(BaseSettings):
+    """Neo4j connection settings, only needed when Graph RAG is used."""
+
+    neo4j_uri: str = Field(default="bolt://localhost:7687", env="NEO4J_URI")
+    neo4j_user: str = Field(default="neo4j", env="NEO4J_USER")
+    neo4j_password: str = Field(default="password", env="NEO4J_PASSWORD")
+
+    class Config(Settings.Config):
+        pass
+
+
+class Mem0Settings(BaseSettings):
+    """Qdrant connection settings, only needed when Mem0 is enabled."""
+
+    qdrant_url: str = Field(default="http://localhost:6333", env="QDRANT_URL")
+    qdrant_api_key: Optional[str] = Field(default=None, env="QDRANT_API_KEY")
+
+    class Config(Settings.Config):
+        pass
+
+
+class ThinkingSettings(BaseSettings):
+    """Limits for extended thinking sessions."""
+
+    max_thinking_duration_minutes: int = Field(default=120, env="MAX_THINKING_DURATION_MINUTES")
+    synthesis_interval_seconds: int = Field(default=300, env="SYNTHESIS_INTERVAL_SECONDS")
+    max_concurrent_thinking_sessions: int = Field(default=5, env="MAX_CONCURRENT_THINKING_SESSIONS")
+
+    class Config(Settings.Config):
+        pass
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the process-wide settings, reading the environment only once.
+
+    Call ``get_settings.cache_clear()`` to reload settings, e.g. in tests.
+    """
+    return Settings()
+
+
+@lru_cache(maxsize=1)
+def get_graph_settings() -> GraphRAGSettings:
+    """Get the Neo4j settings, reading the environment on first use."""
+    return GraphRAGSettings()
+
+
+@lru_cache(maxsize=1)
+def get_mem0_settings() -> Mem0Settings:
+    """Get the Qdrant settings, reading the environment on first use."""
+    return Mem0Settings()
+
+
+@lru_cache(maxsize=1)
+def get_thinking_settings() -> ThinkingSettings:
+    """Get the extended thinking settings, reading the environment on first use."""
+    return ThinkingSettings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
+
+# Relative SQLite paths in database_url are resolved against this directory
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
 
 def get_database_url() -> str:
     """Get the database URL, handling SQLite path resolution."""
-    url = settings.database_url
-    if url.startswith("sqlite:"):
+    return _resolve_database_url(settings.database_url)[0]
+
+
+def get_sqlite_path() -> Optional[Path]:
+    """Get the resolved SQLite database file, or None for other databases."""
+    return _resolve_database_url(settings.database_url)[1]
+
+
+@lru_cache(maxsize=4)
+def _resolve_database_url(url: str) -> Tuple[str, Optional[Path]]:
+    """Resolve relative SQLite paths against the project root.
+
+    Returns:
+        Tuple of (database URL, SQLite file path or None)
+    """
+    if not url.startswith("sqlite:") or ":///" not in url or ":memory:" in url:
+        return url, None
+
+    db_path = Path(url.split("///", 1)[1])
+    if not db_path.is_absolute():
         # Ensure SQLite paths are relative to the project root
-        if ":///" in url and not os.path.isabs(url.split("///")[1]):
-            db_path = url.split("///")[1]
-            project_root = os.path.dirname(os.path.dirname(__file__))
-            full_path = os.path.join(project_root, db_path)
-            url = f"sqlite:///{full_path}"
-    return url
+        db_path = _PROJECT_ROOT / db_path
+        url = f"sqlite:///{db_path}"
+    return url, db_path
 
 
+@lru_cache(maxsize=1)
 def get_context_template() -> str:
     """Get the default context injection template."""
     return """Previous Context:
@@ -101,20 +210,26 @@ Current Conversation:
 {user_prompt}"""
 
 
-def get_allowed_context_types() -> List[str]:
-    """Get the list of allowed context types."""
-    return ["text", "file", "event", "preference", "note"]
+@lru_cache(maxsize=1)
+def get_allowed_context_types() -> Tuple[str, ...]:
+    """Get the allowed context types."""
+    return ("text", "file", "event", "preference", "note")
 
 
-def get_default_permission_scopes() -> List[str]:
+@lru_cache(maxsize=1)
+def get_default_permission_scopes() -> Tuple[str, ...]:
     """Get the default permission scopes."""
-    return ["basic", "preferences", "notes", "files", "events", "all"]
+    return ("basic", "preferences", "notes", "files", "events", "all")
 
 
+@lru_cache(maxsize=1)
 def get_model_profiles() -> Dict[str, Dict[str, Any]]:
     """
     Get predefined model profiles with token window configurations.
 
+    The dictionary is built once and shared between callers, so it must be
+    treated as read-only; copy a profile before modifying it.
+
     Returns:
         Dictionary of model profiles with token limits and configurations
     """
@@ -187,10 +302,21 @@ def get_model_profiles() -> Dict[str, Dict[str, Any]]:
     }
 
 
+@lru_cache(maxsize=1)
+def _profile_prefixes() -> Tuple[str, ...]:
+    """Profile names ordered longest first, so 'llama3.1' is tried before 'llama3'."""
+    names = [name for name in get_model_profiles() if name != "default"]
+    return tuple(sorted(names, key=len, reverse=True))
+
+
+@lru_cache(maxsize=512)
 def get_model_profile(model_id: str) -> Dict[str, Any]:
     """
     Get token configuration for a specific model.
 
+    Results are memoized per ``model_id``; the returned profile is shared
+    and must not be mutated.
+
     Args:
         model_id: Model identifier (e.g., 'llama3.1', 'mistral:latest')
 
@@ -200,21 +326,54 @@ def get_model_profile(model_id: str) -> Dict[str, Any]:
     profiles = get_model_profiles()
 
     # Extract base model name (remove version/tags)
-    model_base = model_id.split(':')[0].lower()
+    model_base = model_id.split(':', 1)[0].lower()
 
     # Try exact match first
-    if model_base in profiles:
-        return profiles[model_base]
+    profile = profiles.get(model_base)
+    if profile is not None:
+        return profile
 
-    # Try partial match
-    for profile_name, profile_config in profiles.items():
-        if profile_name in model_base or model_base in profile_name:
-            return profile_config
+    # Fall back to the longest profile name the model id starts with
+    for profile_name in _profile_prefixes():
+        if model_base.startswith(profile_name):
+            return profiles[profile_name]
 
     # Return default
     return profiles["default"]
 
 
+# (host, port, monotonic probe time, reachable) from the last Ollama check
+_last_ollama_probe: Optional[Tuple[str, int, float, bool]] = None
+
+# Best-effort check only; a local Ollama answers well within this
+OLLAMA_PROBE_TIMEOUT = 0.25
+
+
+def _check_ollama_reachable() -> bool:
+    """Check whether the Ollama port accepts connections, reusing recent results."""
+    global _last_ollama_probe
+
+    host, port = settings.ollama_host, settings.ollama_port
+    now = time.monotonic()
+    probe = _last_ollama_probe
+    if (
+        probe is not None
+        and probe[:2] == (host, port)
+        and now - probe[2] < settings.cache_ttl_seconds
+    ):
+        return probe[3]
+
+    import socket
+    try:
+        with socket.create_connection((host, port), timeout=OLLAMA_PROBE_TIMEOUT):
+            reachable = True
+    except OSError:
+        reachable = False
+
+    _last_ollama_probe = (host, port, now, reachable)
+    return reachable
+
+
 def validate_environment() -> Dict[str, Any]:
     """Validate the current environment and return a status report."""
     issues = []
@@ -222,12 +381,12 @@ def validate_environment() -> Dict[str, Any]:
 
     # Check database accessibility
     db_url = get_database_url()
-    if db_url.startswith("sqlite:"):
-        db_path = db_url.split("///")[1]
-        db_dir = os.path.dirname(db_path)
-        if not os.path.exists(db_dir):
+    db_path = get_sqlite_path()
+    if db_path is not None:
+        db_dir = db_path.parent
+        if not db_dir.exists():
             try:
-                os.makedirs(db_dir, exist_ok=True)
+                db_dir.mkdir(parents=True, exist_ok=True)
             except PermissionError:
                 issues.append(f"Cannot create database directory: {db_dir}")
 
@@ -238,14 +397,9 @@ def validate_environment() -> Dict[str, Any]:
     if not settings.encryption_key:
         warnings.append("No encryption key set - sensitive data will be stored in plaintext")
 
-    # Check Ollama connectivity (non-blocking)
+    # Check Ollama connectivity (non-blocking, cached for cache_ttl_seconds)
     try:
-        import socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(1)
-        result = sock.connect_ex((settings.ollama_host, settings.ollama_port))
-        sock.close()
-        if result != 0:
+        if not _check_ollama_reachable():
             warnings.append(f"Ollama not accessible at {settings.ollama_host}:{settings.ollama_port}")
     except Exception:
         warnings.append("Could not check Ollama connectivity")
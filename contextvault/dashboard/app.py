@@ -7,67 +7,112 @@ Access at http://localhost:8080
 
 import asyncio
 import json
-from datetime import datetime
+import time
+import uuid
 from pathlib import Path
+from typing import Any, Dict, List, Tuple
 
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import func, insert
+from sqlalchemy.orm import load_only
 
 from ..services.troubleshooting import get_troubleshooting_agent
 from ..database import get_db_context
 from ..models.context import ContextEntry
 from ..models.permissions import Permission
 
-app = FastAPI(title="ContextVault Dashboard", version="0.1.0")
+# Characters of content shown for each recent entry on the dashboard
+CONTENT_PREVIEW_CHARS = 100
 
-# Setup templates
+app = FastAPI(
+    title="ContextVault Dashboard",
+    version="0.1.0",
+    default_response_class=ORJSONResponse
+)
+
+# Setup templates: compiled once and kept, with compiled bytecode cached on
+# disk across restarts; restart the dashboard to pick up template edits
 templates = Jinja2Templates(directory=Path(__file__).parent / "templates")
+templates.env.auto_reload = False
+templates.env.bytecode_cache = FileSystemBytecodeCache()
 
 # Mount static files
 app.mount("/static", StaticFiles(directory=Path(__file__).parent / "static"), name="static")
 
-@app.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request):
-    """Main dashboard page."""
-    
-    # Get system status
-    troubleshooter = get_troubleshooting_agent()
-    diagnostics = troubleshooter.run_full_diagnostics()
-    
-    # Get context statistics
+def _load_dashboard_stats() -> Dict[str, Any]:
+    """Collect the context statistics shown on the dashboard page."""
     with get_db_context() as db:
-        context_count = db.query(ContextEntry).count()
-        permission_count = db.query(Permission).count()
+        permission_count = db.query(func.count(Permission.id)).scalar()
         
-        # Get recent context entries
-        recent_entries = db.query(ContextEntry).order_by(
+        # Get recent context entries (summary columns only, content truncated in SQL)
+        recent_entries = db.query(
+            ContextEntry.id,
+            ContextEntry.context_type,
+            ContextEntry.source,
+            ContextEntry.created_at,
+            ContextEntry.access_count,
+            func.substr(ContextEntry.content, 1, CONTENT_PREVIEW_CHARS + 1).label("content_preview"),
+        ).order_by(
             ContextEntry.created_at.desc()
         ).limit(5).all()
         
         # Get context by type
-        context_by_type = {}
-        for entry in db.query(ContextEntry).all():
-            ctx_type = entry.context_type
-            context_by_type[ctx_type] = context_by_type.get(ctx_type, 0) + 1
+        context_by_type = dict(
+            db.query(ContextEntry.context_type, func.count())
+            .group_by(ContextEntry.context_type)
+            .all()
+        )
     
-    return templates.TemplateResponse("dashboard.html", {
-        "request": request,
-        "diagnostics": diagnostics,
-        "context_count": context_count,
+    return {
+        # The per-type counts cover every row, so they also give the total
+        "context_count": sum(context_by_type.values()),
         "permission_count": permission_count,
         "recent_entries": recent_entries,
         "context_by_type": context_by_type,
-        "timestamp": datetime.now().isoformat()
+    }
+
+def _run_diagnostics() -> Dict[str, Any]:
+    """Run the troubleshooting agent's full diagnostics."""
+    return get_troubleshooting_agent().run_full_diagnostics()
+
+# (epoch second, ISO timestamp) last shown on the dashboard
+_last_timestamp: Tuple[int, str] = (0, "")
+
+def _current_timestamp() -> str:
+    """Local ISO timestamp to the second, formatted at most once per second."""
+    global _last_timestamp
+    
+    second = int(time.time())
+    if _last_timestamp[0] != second:
+        _last_timestamp = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second)))
+    return _last_timestamp[1]
+
+@app.get("/", response_class=HTMLResponse)
+async def dashboard(request: Request):
+    """Main dashboard page."""
+    
+    # Diagnostics and queries block, so both run in the threadpool
+    diagnostics = await run_in_threadpool(_run_diagnostics)
+    stats = await run_in_threadpool(_load_dashboard_stats)
+    
+    return templates.TemplateResponse("dashboard.html", {
+        "request": request,
+        "diagnostics": diagnostics,
+        **stats,
+        "content_preview_chars": CONTENT_PREVIEW_CHARS,
+        "timestamp": _current_timestamp()
     })
 
 @app.get("/api/status")
 async def api_status():
     """API endpoint for system status."""
     try:
-        troubleshooter = get_troubleshooting_agent()
-        diagnostics = troubleshooter.run_full_diagnostics()
+        diagnostics = await run_in_threadpool(_run_diagnostics)
         
         return {
             "status": "success",
@@ -76,103 +121,168 @@ async def api_status():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _load_recent_context(limit: int = 50) -> List[Dict[str, Any]]:
+    """Load the most recent context entries as JSON-ready dicts."""
+    with get_db_context() as db:
+        # Skip the embedding blob and metadata, which the response never includes
+        entries = db.query(ContextEntry).options(
+            load_only(
+                ContextEntry.id,
+                ContextEntry.content,
+                ContextEntry.context_type,
+                ContextEntry.source,
+                ContextEntry.tags,
+                ContextEntry.created_at,
+                ContextEntry.access_count,
+            )
+        ).order_by(
+            ContextEntry.created_at.desc()
+        ).limit(limit).all()
+        
+        return [
+            {
+                "id": entry.id,
+                "content": entry.content,
+                "context_type": entry.context_type,
+                "source": entry.source,
+                "tags": entry.tags,
+                "created_at": entry.created_at,
+                "access_count": entry.access_count
+            }
+            for entry in entries
+        ]
+
 @app.get("/api/context")
 async def api_context():
     """API endpoint for context entries."""
     try:
-        with get_db_context() as db:
-            entries = db.query(ContextEntry).order_by(
-                ContextEntry.created_at.desc()
-            ).limit(50).all()
-            
-            context_data = []
-            for entry in entries:
-                context_data.append({
-                    "id": entry.id,
-                    "content": entry.content,
-                    "context_type": entry.context_type,
-                    "source": entry.source,
-                    "tags": entry.tags,
-                    "created_at": entry.created_at.isoformat(),
-                    "access_count": entry.access_count
-                })
-            
-            return {
-                "status": "success",
-                "data": context_data
-            }
+        # The query is synchronous, keep it off the event loop
+        context_data = await run_in_threadpool(_load_recent_context)
+        return {"status": "success", "data": context_data}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _load_permissions() -> List[Dict[str, Any]]:
+    """Load all permissions as JSON-ready dicts."""
+    with get_db_context() as db:
+        return [
+            {
+                "id": perm.id,
+                "model_id": perm.model_id,
+                "model_name": perm.model_name,
+                "allowed_scopes": perm.get_allowed_scopes(),
+                "is_active": perm.is_active,
+                "created_at": perm.created_at
+            }
+            for perm in db.query(Permission).all()
+        ]
+
 @app.get("/api/permissions")
 async def api_permissions():
     """API endpoint for permissions."""
     try:
-        with get_db_context() as db:
-            permissions = db.query(Permission).all()
-            
-            permission_data = []
-            for perm in permissions:
-                permission_data.append({
-                    "id": perm.id,
-                    "model_id": perm.model_id,
-                    "model_name": perm.model_name,
-                    "allowed_scopes": perm.get_allowed_scopes(),
-                    "is_active": perm.is_active,
-                    "created_at": perm.created_at.isoformat()
-                })
-            
-            return {
-                "status": "success",
-                "data": permission_data
-            }
+        permission_data = await run_in_threadpool(_load_permissions)
+        
+        return {
+            "status": "success",
+            "data": permission_data
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _add_context(data: Dict[str, Any]) -> str:
+    """Store a context entry from dashboard input and return its ID."""
+    with get_db_context() as db:
+        entry = ContextEntry(
+            content=data.get("content", ""),
+            context_type=data.get("context_type", "note"),
+            source=data.get("source", "dashboard"),
+            tags=data.get("tags", [])
+        )
+        db.add(entry)
+        db.commit()
+        return entry.id
+
 @app.post("/api/context/add")
 async def api_add_context(request: Request):
     """API endpoint to add context."""
     try:
         data = await request.json()
+        entry_id = await run_in_threadpool(_add_context, data)
         
+        return {
+            "status": "success",
+            "message": "Context added successfully",
+            "data": {"id": entry_id}
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _add_context_bulk(items: List[Dict[str, Any]]) -> List[str]:
+    """Store many context entries in one INSERT and one commit, returning their IDs."""
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "content": data.get("content", ""),
+            "context_type": data.get("context_type", "note"),
+            "source": data.get("source", "dashboard"),
+            "tags": data.get("tags", [])
+        }
+        for data in items
+    ]
+    if rows:
         with get_db_context() as db:
-            entry = ContextEntry(
-                content=data.get("content", ""),
-                context_type=data.get("context_type", "note"),
-                source=data.get("source", "dashboard"),
-                tags=data.get("tags", [])
-            )
-            db.add(entry)
-            db.commit()
-            
-            return {
-                "status": "success",
-                "message": "Context added successfully",
-                "data": {"id": entry.id}
-            }
+            db.execute(insert(ContextEntry), rows)
+    return [row["id"] for row in rows]
+
+@app.post("/api/context/bulk_add")
+async def api_bulk_add_context(request: Request):
+    """API endpoint to add a list of context entries in a single transaction."""
+    try:
+        data = await request.json()
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        raise HTTPException(status_code=400, detail="Expected a JSON list of context objects")
+    
+    try:
+        entry_ids = await run_in_threadpool(_add_context_bulk, data)
+        
+        return {
+            "status": "success",
+            "message": f"Added {len(entry_ids)} context entries",
+            "data": {"ids": entry_ids}
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _delete_context(context_id: str) -> bool:
+    """Delete a context entry, returning False if it does not exist."""
+    with get_db_context() as db:
+        entry = db.query(ContextEntry).filter(ContextEntry.id == context_id).first()
+        if not entry:
+            return False
+        
+        db.delete(entry)
+        db.commit()
+        return True
+
 @app.delete("/api/context/{context_id}")
 async def api_delete_context(context_id: str):
     """API endpoint to delete context."""
     try:
-        with get_db_context() as db:
-            entry = db.query(ContextEntry).filter(ContextEntry.id == context_id).first()
-            if not entry:
-                raise HTTPException(status_code=404, detail="Context not found")
-            
-            db.delete(entry)
-            db.commit()
-            
-            return {
-                "status": "success",
-                "message": "Context deleted successfully"
-            }
-    except HTTPException:
-        raise
+        deleted = await run_in_threadpool(_delete_context, context_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Context not found")
+    
+    return {
+        "status": "success",
+        "message": "Context deleted successfully"
+    }
 
 if __name__ == "__main__":
     import uvicorn
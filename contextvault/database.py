@@ -1,13 +1,15 @@
 """Database connection and session management for ContextVault."""
 
 import logging
+import threading
+import time
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Generator, Optional
 
 from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import DeclarativeBase, scoped_session, sessionmaker, Session
+from sqlalchemy.pool import QueuePool, StaticPool
 
 from .config import get_database_url, settings
 
@@ -19,6 +21,16 @@ class Base(DeclarativeBase):
     pass
 
 
+# Connection pool limits for file-backed SQLite databases
+SQLITE_POOL_SIZE = 5
+SQLITE_MAX_OVERFLOW = 10
+
+
+def _is_sqlite_memory_url(database_url: str) -> bool:
+    """Check whether a SQLite URL points at an in-memory database."""
+    return database_url in ("sqlite://", "sqlite:///") or ":memory:" in database_url or "mode=memory" in database_url
+
+
 # Database engine configuration
 def create_database_engine() -> Engine:
     """Create and configure the database engine."""
@@ -30,7 +42,6 @@ def create_database_engine() -> Engine:
     if database_url.startswith("sqlite:"):
         # SQLite-specific configuration
         engine_kwargs.update({
-            "poolclass": StaticPool,
             "connect_args": {
                 "check_same_thread": False,
                 "timeout": 20,
@@ -38,6 +49,16 @@ def create_database_engine() -> Engine:
             "echo": settings.log_level == "DEBUG",
             "future": True,
         })
+        if _is_sqlite_memory_url(database_url):
+            # Each connection to :memory: is a separate database, so share one
+            engine_kwargs["poolclass"] = StaticPool
+        else:
+            # WAL lets readers run alongside the writer on separate connections
+            engine_kwargs.update({
+                "poolclass": QueuePool,
+                "pool_size": SQLITE_POOL_SIZE,
+                "max_overflow": SQLITE_MAX_OVERFLOW,
+            })
     else:
         # PostgreSQL/MySQL configuration
         engine_kwargs.update({
@@ -59,15 +80,34 @@ def create_database_engine() -> Engine:
             # Enable foreign key constraints
             cursor.execute("PRAGMA foreign_keys=ON")
             
+            # Larger pages suit text/JSON rows; only takes effect on a new,
+            # empty database, so it must run before WAL mode writes the header
+            cursor.execute("PRAGMA page_size=8192")
+            
             # Enable WAL mode for better concurrency
             cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA wal_autocheckpoint=1000")
+            
+            # Wait for a competing writer instead of failing straight away
+            cursor.execute("PRAGMA busy_timeout=5000")
             
             # Optimize for speed vs safety (adjust as needed)
             cursor.execute("PRAGMA synchronous=NORMAL")
             cursor.execute("PRAGMA cache_size=10000")
             cursor.execute("PRAGMA temp_store=MEMORY")
             
+            # Serve reads from the OS page cache via a 256 MB memory map
+            cursor.execute("PRAGMA mmap_size=268435456")
+            
             cursor.close()
+        
+        @event.listens_for(engine, "close")
+        def optimize_sqlite_on_close(dbapi_connection, connection_record):
+            """Let SQLite refresh query planner statistics before disconnecting."""
+            try:
+                dbapi_connection.execute("PRAGMA optimize")
+            except Exception as e:
+                logger.debug(f"PRAGMA optimize skipped: {e}")
     
     return engine
 
@@ -76,6 +116,11 @@ def create_database_engine() -> Engine:
 engine = create_database_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# One reusable session per thread for get_db_context(); close() resets it
+# between uses, so this only saves constructing a new Session every time
+ScopedSession = scoped_session(SessionLocal)
+_context_state = threading.local()
+
 
 def get_db_session() -> Generator[Session, None, None]:
     """
@@ -104,7 +149,14 @@ def get_db_context() -> Generator[Session, None, None]:
     Yields:
         Session: SQLAlchemy database session
     """
-    db = SessionLocal()
+    # A nested context gets its own session so it still commits independently
+    outermost = not getattr(_context_state, "active", False)
+    if outermost:
+        db = ScopedSession()
+        _context_state.active = True
+    else:
+        db = SessionLocal()
+    
     try:
         yield db
         db.commit()
@@ -113,6 +165,8 @@ def get_db_context() -> Generator[Session, None, None]:
         raise
     finally:
         db.close()
+        if outermost:
+            _context_state.active = False
 
 
 def create_tables() -> None:
@@ -151,6 +205,26 @@ def check_database_connection() -> bool:
         return False
 
 
+# Monotonic time of the last successful SELECT 1 from get_database_info()
+_last_db_probe_ok: Optional[float] = None
+
+
+def _probe_database() -> bool:
+    """Run SELECT 1, trusting a successful probe for cache_ttl_seconds."""
+    global _last_db_probe_ok
+    
+    now = time.monotonic()
+    if _last_db_probe_ok is not None and now - _last_db_probe_ok < settings.cache_ttl_seconds:
+        return True
+    
+    with engine.connect() as conn:
+        connected = conn.execute(text("SELECT 1")).scalar() == 1
+    
+    # Failures are not cached so a recovered database is noticed straight away
+    _last_db_probe_ok = now if connected else None
+    return connected
+
+
 def get_database_info() -> dict:
     """
     Get information about the database.
@@ -169,9 +243,7 @@ def get_database_info() -> dict:
                 if len(protocol_user) == 2:
                     safe_url = f"{protocol_user[0]}://***:***@{parts[1]}"
         
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT 1")).scalar()
-            connected = result == 1
+        connected = _probe_database()
     except Exception:
         connected = False
     
@@ -179,12 +251,18 @@ def get_database_info() -> dict:
         "url": safe_url,
         "driver": engine.dialect.name,
         "connected": connected,
-        "pool_size": getattr(engine.pool, "size", "N/A"),
-        "pool_checked_in": getattr(engine.pool, "checkedin", "N/A"),
-        "pool_checked_out": getattr(engine.pool, "checkedout", "N/A"),
+        "pool_size": _pool_stat("size"),
+        "pool_checked_in": _pool_stat("checkedin"),
+        "pool_checked_out": _pool_stat("checkedout"),
     }
 
 
+def _pool_stat(name: str) -> Any:
+    """Read a QueuePool counter such as ``size()``, or "N/A" if the pool has none."""
+    stat = getattr(engine.pool, name, None)
+    return stat() if callable(stat) else "N/A"
+
+
 def init_database() -> None:
     """
     Initialize the database with tables and basic setup.
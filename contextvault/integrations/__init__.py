@@ -1,10 +1,11 @@
 """AI model integrations for ContextVault."""
 
-from .base import BaseIntegration
+from .base import BaseIntegration, flush_sessions
 from .ollama import OllamaIntegration, ollama_integration
 
 __all__ = [
     "BaseIntegration",
+    "flush_sessions",
     "OllamaIntegration", 
     "ollama_integration",
 ]
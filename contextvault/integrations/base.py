@@ -1,13 +1,88 @@
 """Base integration class for AI model integrations."""
 
+import asyncio
 import logging
+import re
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+import httpx
+import orjson
+
+from ..database import get_db_context
 from ..models import Session as SessionModel
 
 logger = logging.getLogger(__name__)
 
+# First "model": "<name>" field in a JSON request body
+_MODEL_FIELD_RE = re.compile(rb'"model"\s*:\s*"([^"\\]+)"')
+
+# Request body that starts (after whitespace) like a JSON object
+_JSON_OBJECT_START_RE = re.compile(rb"\s*\{")
+
+# Most sessions written to the database in one commit
+SESSION_BATCH_SIZE = 100
+
+# Request headers recomputed by the HTTP client for the upstream request
+_CLIENT_MANAGED_HEADERS = frozenset({"content-length", "host", "transfer-encoding"})
+
+# Response headers that no longer describe a streamed (decoded) body
+_STREAMED_RESPONSE_HEADERS = frozenset({"content-length", "content-encoding", "transfer-encoding"})
+
+# Read size when relaying a streamed upstream response
+STREAM_CHUNK_SIZE = 65536
+
+
+class _SessionWriter:
+    """Persists proxy sessions from a background task, off the request path."""
+    
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def submit(self, session: SessionModel) -> None:
+        """Queue a completed session, starting the writer task if needed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._task = loop.create_task(self._drain())
+        self._queue.put_nowait(session)
+    
+    async def flush(self) -> None:
+        """Wait until every queued session has been written."""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+    
+    async def _drain(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < SESSION_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception as e:
+                logger.warning(f"Failed to save {len(batch)} sessions: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    @staticmethod
+    def _write(batch: List[SessionModel]) -> None:
+        with get_db_context() as db:
+            db.add_all(batch)
+
+
+_session_writer = _SessionWriter()
+
+
+async def flush_sessions() -> None:
+    """Write out proxy sessions still queued for persistence (call on shutdown)."""
+    await _session_writer.flush()
+
 
 class BaseIntegration(ABC):
     """Base class for AI model integrations."""
@@ -26,6 +101,59 @@ class BaseIntegration(ABC):
         self.port = port
         self.endpoint = f"http://{host}:{port}"
         self.logger = logging.getLogger(f"{__name__}.{name}")
+        
+        # Static description returned by get_integration_info()
+        self._info: Dict[str, Any] = {
+            "name": name,
+            "type": "ai_model_integration",
+            "endpoint": self.endpoint,
+            "host": host,
+            "port": port,
+            "capabilities": {
+                "context_injection": True,
+                "model_detection": True,
+                "health_check": True,
+                "prompt_formatting": True,
+            }
+        }
+        
+        # Shared keep-alive client, created lazily per event loop
+        self._client = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def _get_client(self):
+        """
+        Get the shared HTTP client for this integration's endpoint.
+        
+        The client keeps connections alive between requests. A new one is
+        created if the previous client was closed or belongs to another event
+        loop (e.g. a later ``asyncio.run`` call from the CLI).
+        
+        Returns:
+            httpx.AsyncClient bound to the integration endpoint
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.endpoint,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100),
+            )
+            self._client_loop = loop
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        client, self._client = self._client, None
+        if client is not None and self._client_loop is asyncio.get_running_loop():
+            await client.aclose()
+        self._client_loop = None
+    
+    async def __aenter__(self) -> "BaseIntegration":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
     
     @abstractmethod
     async def inject_context(
@@ -111,24 +239,22 @@ class BaseIntegration(ABC):
             Dictionary with health status information
         """
         try:
-            import httpx
+            client = await self._get_client()
+            response = await client.get("/", timeout=5.0)
+            
+            if response.status_code == 200:
+                status = "healthy"
+            else:
+                status = "degraded"
+            
+            return {
+                "integration": self.name,
+                "status": status,
+                "endpoint": self.endpoint,
+                "response_code": response.status_code,
+                "available": True,
+            }
             
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.endpoint}/")
-                
-                if response.status_code == 200:
-                    status = "healthy"
-                else:
-                    status = "degraded"
-                
-                return {
-                    "integration": self.name,
-                    "status": status,
-                    "endpoint": self.endpoint,
-                    "response_code": response.status_code,
-                    "available": True,
-                }
-                
         except Exception as e:
             self.logger.warning(f"Health check failed for {self.name}", exc_info=True)
             return {
@@ -144,21 +270,10 @@ class BaseIntegration(ABC):
         Get information about this integration.
         
         Returns:
-            Dictionary with integration information
+            Dictionary with integration information (``capabilities`` is
+            shared between calls and must not be modified)
         """
-        return {
-            "name": self.name,
-            "type": "ai_model_integration",
-            "endpoint": self.endpoint,
-            "host": self.host,
-            "port": self.port,
-            "capabilities": {
-                "context_injection": True,
-                "model_detection": True,
-                "health_check": True,
-                "prompt_formatting": True,
-            }
-        }
+        return self._info.copy()
     
     def create_session(
         self,
@@ -204,24 +319,51 @@ class BaseIntegration(ABC):
             processing_time_ms: Processing time in milliseconds
             error: Error message if request failed
         """
-        log_data = {
-            "integration": self.name,
-            "model_id": model_id,
-            "request_type": request_type,
-            "success": success,
-            "context_count": context_count,
-        }
+        level = logging.INFO if success else logging.ERROR
+        if not self.logger.isEnabledFor(level):
+            return
         
-        if processing_time_ms is not None:
-            log_data["processing_time_ms"] = processing_time_ms
+        # Fields go in ``extra`` for structured handlers; the message is
+        # formatted lazily by the logging module
+        self.logger.log(
+            level,
+            "Integration request %s: %s %s (model=%s, context=%d, time_ms=%s, error=%s)",
+            "completed" if success else "failed",
+            self.name,
+            request_type,
+            model_id,
+            context_count,
+            processing_time_ms,
+            error,
+            extra={
+                "integration": self.name,
+                "model_id": model_id,
+                "request_type": request_type,
+                "success": success,
+                "context_count": context_count,
+                "processing_time_ms": processing_time_ms,
+                "error": error,
+            },
+        )
+    
+    def peek_model_id(self, body: bytes) -> Optional[str]:
+        """
+        Find the model ID in a raw request body without parsing it.
         
-        if error:
-            log_data["error"] = error
+        Used when the body is proxied unchanged. The default looks for a
+        ``"model"`` string field; integrations that name it differently
+        should override this together with ``extract_model_id``.
         
-        if success:
-            self.logger.info(f"Integration request completed: {log_data}")
-        else:
-            self.logger.error(f"Integration request failed: {log_data}")
+        Args:
+            body: Raw JSON request body
+            
+        Returns:
+            Model ID if found, None otherwise
+        """
+        match = _MODEL_FIELD_RE.search(body)
+        if match is None:
+            return None
+        return match.group(1).decode("utf-8", errors="replace")
     
     async def proxy_request(
         self,
@@ -230,6 +372,7 @@ class BaseIntegration(ABC):
         headers: Dict[str, str],
         body: Optional[bytes] = None,
         inject_context: bool = True,
+        stream: bool = False,
     ) -> Dict[str, Any]:
         """
         Proxy a request to the AI service with optional context injection.
@@ -240,27 +383,42 @@ class BaseIntegration(ABC):
             headers: Request headers
             body: Request body
             inject_context: Whether to inject context
+            stream: Relay the response body as it arrives instead of
+                buffering it
             
         Returns:
-            Dictionary with response data and metadata
+            Dictionary with response data and metadata. With ``stream`` the
+            body is under ``"stream"`` (an async iterator of bytes that must
+            be consumed or closed) rather than ``"content"``, and session
+            tracking completes when the stream ends.
         """
+        # Copy with lower-cased names so the caller's dict is left alone and
+        # httpx sets Content-Length/Host for the body actually sent
+        headers = {
+            key.lower(): value
+            for key, value in headers.items()
+            if key.lower() not in _CLIENT_MANAGED_HEADERS
+        }
+        
+        session = None
         try:
-            import httpx
-            import json
-            
-            # Parse request body
             request_data = {}
-            if body:
-                try:
-                    request_data = json.loads(body.decode('utf-8'))
-                except json.JSONDecodeError:
-                    request_data = {}
-            
-            # Extract model ID
-            model_id = self.extract_model_id(request_data)
+            if inject_context:
+                # Parse request body (orjson reads the bytes directly); bodies
+                # that can't be a JSON object skip the parser and its exception
+                if body and _JSON_OBJECT_START_RE.match(body):
+                    try:
+                        request_data = orjson.loads(body)
+                    except orjson.JSONDecodeError:
+                        request_data = {}
+                
+                # Extract model ID
+                model_id = self.extract_model_id(request_data)
+            else:
+                # The body is forwarded untouched, so only the model is needed
+                model_id = self.peek_model_id(body) if body else None
             
             # Create session for tracking
-            session = None
             session_id = None
             if model_id:
                 session = self.create_session(model_id, source=f"{self.name}_proxy")
@@ -270,71 +428,135 @@ class BaseIntegration(ABC):
             if inject_context and model_id and request_data:
                 try:
                     request_data = await self.inject_context(request_data, model_id, session)
-                    body = json.dumps(request_data).encode('utf-8')
-                    headers['content-length'] = str(len(body))
+                    body = orjson.dumps(request_data)
                 except Exception as e:
                     self.logger.warning(f"Context injection failed: {e}")
             
-            # Make request to actual service
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.request(
+            # Make request to actual service over the shared keep-alive client
+            client = await self._get_client()
+            if stream:
+                upstream = client.build_request(
                     method=method,
-                    url=f"{self.endpoint}{path}",
+                    url=path,
                     headers=headers,
                     content=body,
                 )
-                
-                # Learn from conversation if successful
-                if response.status_code == 200 and session and inject_context:
-                    try:
-                        await self._learn_from_conversation(
-                            request_data, 
-                            response.content, 
-                            model_id, 
-                            session_id
-                        )
-                    except Exception as e:
-                        self.logger.warning(f"Conversation learning failed: {e}")
-                
-                # Complete session tracking
-                if session:
-                    session.complete_session(
-                        success=response.status_code < 400,
-                        error_message=None if response.status_code < 400 else f"HTTP {response.status_code}",
-                    )
-                    
-                    # Save session to database
-                    from ..database import get_db_context
-                    try:
-                        with get_db_context() as db:
-                            db.add(session)
-                            db.commit()
-                    except Exception as e:
-                        self.logger.warning(f"Failed to save session: {e}")
-                
+                response = await client.send(upstream, stream=True)
                 return {
                     "status_code": response.status_code,
-                    "headers": dict(response.headers),
-                    "content": response.content,
+                    "headers": {
+                        key: value
+                        for key, value in response.headers.items()
+                        if key.lower() not in _STREAMED_RESPONSE_HEADERS
+                    },
+                    "stream": self._relay_response(
+                        response,
+                        request_data if inject_context else None,
+                        model_id,
+                        session,
+                        session_id,
+                    ),
                     "session_id": session_id,
                 }
+            
+            response = await client.request(
+                method=method,
+                url=path,
+                headers=headers,
+                content=body,
+            )
+            
+            # Learn from conversation if successful
+            if response.status_code == 200 and session and inject_context:
+                try:
+                    await self._learn_from_conversation(
+                        request_data, 
+                        response.content, 
+                        model_id, 
+                        session_id
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Conversation learning failed: {e}")
+            
+            # Complete session tracking
+            if session:
+                session.complete_session(
+                    success=response.status_code < 400,
+                    error_message=None if response.status_code < 400 else f"HTTP {response.status_code}",
+                )
                 
+                # Saved in batches by the background session writer
+                _session_writer.submit(session)
+            
+            return {
+                "status_code": response.status_code,
+                "headers": dict(response.headers),
+                "content": response.content,
+                "session_id": session_id,
+            }
+            
         except Exception as e:
             self.logger.error(f"Proxy request failed: {e}", exc_info=True)
             
             # Complete session with error if it exists
             if session:
                 session.complete_session(success=False, error_message=str(e))
-                try:
-                    from ..database import get_db_context
-                    with get_db_context() as db:
-                        db.add(session)
-                        db.commit()
-                except Exception:
-                    pass
+                _session_writer.submit(session)
             
             raise
     
+    async def _relay_response(
+        self,
+        response: Any,
+        request_data: Optional[Dict[str, Any]],
+        model_id: Optional[str],
+        session: Optional[SessionModel],
+        session_id: Optional[str],
+    ) -> AsyncIterator[bytes]:
+        """Yield a streamed upstream response, then finish session tracking."""
+        learn = response.status_code == 200 and session is not None and request_data is not None
+        chunks: List[bytes] = []
+        completed = False
+        error: Optional[Exception] = None
+        try:
+            async for chunk in response.aiter_bytes(chunk_size=STREAM_CHUNK_SIZE):
+                if learn:
+                    chunks.append(chunk)
+                yield chunk
+            completed = True
+        except Exception as e:
+            error = e
+            self.logger.error(f"Proxy stream failed: {e}", exc_info=True)
+            raise
+        finally:
+            await response.aclose()
+            if session:
+                if completed:
+                    session.complete_session(
+                        success=response.status_code < 400,
+                        error_message=None if response.status_code < 400 else f"HTTP {response.status_code}",
+                    )
+                else:
+                    # Cancellation or an early close (GeneratorExit) skips the
+                    # except branch, so an unfinished stream is reported here
+                    session.complete_session(
+                        success=False,
+                        error_message=str(error) if error is not None else "client disconnected",
+                    )
+                _session_writer.submit(session)
+        
+        # Learn from conversation once the whole response has been relayed
+        if learn:
+            try:
+                await self._learn_from_conversation(
+                    request_data,
+                    b"".join(chunks),
+                    model_id,
+                    session_id
+                )
+            except Exception as e:
+                self.logger.warning(f"Conversation learning failed: {e}")
+    
     async def _learn_from_conversation(
         self,
         request_data: Dict[str, Any],
@@ -354,7 +576,7 @@ class BaseIntegration(ABC):
             # Extract AI response
             ai_response = ""
             try:
-                response_data = json.loads(response_content.decode('utf-8'))
+                response_data = orjson.loads(response_content)
                 
                 # Handle streaming response
                 if isinstance(response_data, list):
@@ -363,7 +585,7 @@ class BaseIntegration(ABC):
                 elif isinstance(response_data, dict):
                     ai_response = response_data.get("response", "")
                     
-            except (json.JSONDecodeError, UnicodeDecodeError):
+            except orjson.JSONDecodeError:
                 # Try to extract text from raw response
                 try:
                     ai_response = response_content.decode('utf-8')
@@ -1,32 +1,29 @@
 """MCP client for communicating with MCP servers."""
 
 import asyncio
-import json
 import logging
-import subprocess
-from typing import Any, Dict, List, Optional, Union
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, TypedDict, Union
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Most entries an MCPCache holds before evicting the oldest
+CACHE_MAXSIZE = 10000
 
-@dataclass
-class MCPRequest:
-    """MCP request structure."""
-    jsonrpc: str = "2.0"
-    id: Optional[Union[str, int]] = None
-    method: str = ""
-    params: Optional[Dict[str, Any]] = None
+# Longest JSON-RPC line read from a stdio server (asyncio's default is 64 KiB,
+# too small for resources/read results)
+STDIO_LINE_LIMIT = 16 * 1024 * 1024
 
 
-@dataclass
-class MCPResponse:
-    """MCP response structure."""
-    jsonrpc: str = "2.0"
-    id: Optional[Union[str, int]] = None
-    result: Optional[Any] = None
-    error: Optional[Dict[str, Any]] = None
+class MCPResponse(TypedDict, total=False):
+    """MCP response structure (the decoded JSON-RPC message)."""
+    jsonrpc: str
+    id: Union[str, int]
+    result: Any
+    error: Dict[str, Any]
 
 
 class MCPClient:
@@ -36,12 +33,20 @@ class MCPClient:
         self.connection_id = connection_id
         self.endpoint = endpoint
         self.config = config or {}
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
         self._request_id = 0
         self._capabilities: Dict[str, Any] = {}
         self._resources: List[Dict[str, Any]] = []
         self._tools: List[Dict[str, Any]] = []
         self._connected = False
+        # Guards one request/response exchange on the stdio pipes; created in
+        # connect() so it belongs to the event loop that owns the process
+        self._io_lock: Optional[asyncio.Lock] = None
+        # Read-through cache for list/read calls, with at most one request
+        # in flight per key
+        self._cache = MCPCache(maxsize=self.config.get("cache_maxsize", CACHE_MAXSIZE))
+        self._cache_ttl = self.config.get("cache_ttl", 300)
+        self._inflight: Dict[str, asyncio.Future] = {}
         
     async def connect(self) -> bool:
         """Connect to MCP server."""
@@ -49,13 +54,13 @@ class MCPClient:
             if self.endpoint.startswith("stdio:"):
                 # Stdio-based connection
                 command = self.endpoint[6:].split()
-                self.process = subprocess.Popen(
-                    command,
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    bufsize=0
+                self._io_lock = asyncio.Lock()
+                self.process = await asyncio.create_subprocess_exec(
+                    *command,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    limit=self.config.get("stdio_line_limit", STDIO_LINE_LIMIT),
                 )
                 logger.info(f"Connected to MCP server via stdio: {' '.join(command)}")
             else:
@@ -63,37 +68,46 @@ class MCPClient:
                 logger.warning(f"TCP/HTTP MCP connections not yet implemented: {self.endpoint}")
                 return False
             
-            # Initialize the connection
-            await self._initialize()
+            # Initialize the connection (requests need the connected flag set);
+            # bounded so a server that never answers can't wedge the client
             self._connected = True
+            await asyncio.wait_for(
+                self._initialize(), timeout=self.config.get("init_timeout", 10)
+            )
             return True
             
         except Exception as e:
-            logger.error(f"Failed to connect to MCP server {self.connection_id}: {e}")
+            logger.error(f"Failed to connect to MCP server {self.connection_id}: {e!r}")
+            if self.process is not None:
+                await self.disconnect()
+            self._connected = False
             return False
     
     async def disconnect(self) -> None:
         """Disconnect from MCP server."""
         if self.process:
             try:
-                self.process.terminate()
-                self.process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
+                if self.process.returncode is None:
+                    self.process.terminate()
+                    await asyncio.wait_for(self.process.wait(), timeout=5)
+            except asyncio.TimeoutError:
                 self.process.kill()
+                await self.process.wait()
             except Exception as e:
                 logger.error(f"Error disconnecting from MCP server: {e}")
             finally:
                 self.process = None
         
+        self._cache.clear()
         self._connected = False
         logger.info(f"Disconnected from MCP server {self.connection_id}")
     
     async def _initialize(self) -> None:
         """Initialize MCP connection and get capabilities."""
         # Send initialize request
-        init_request = MCPRequest(
-            method="initialize",
-            params={
+        response = await self._send_request(
+            "initialize",
+            {
                 "protocolVersion": "2024-11-05",
                 "capabilities": {
                     "resources": {"subscribe": True, "listChanged": True},
@@ -106,101 +120,116 @@ class MCPClient:
                 }
             }
         )
-        
-        response = await self._send_request(init_request)
-        if response and response.result:
-            self._capabilities = response.result.get("capabilities", {})
+        if response and response.get("result"):
+            self._capabilities = response["result"].get("capabilities", {})
             logger.info(f"MCP server capabilities: {self._capabilities}")
         
-        # Get available resources
-        await self._list_resources()
-        
-        # Get available tools
-        await self._list_tools()
+        # Get available resources and tools
+        await asyncio.gather(self._list_resources(), self._list_tools())
     
-    async def _send_request(self, request: MCPRequest) -> Optional[MCPResponse]:
-        """Send request to MCP server."""
+    async def _send_request(
+        self, method: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[MCPResponse]:
+        """Send a JSON-RPC request to the MCP server."""
         if not self.process or not self._connected:
             logger.error("MCP client not connected")
             return None
         
-        request.id = self._request_id
+        request_id = self._request_id
         self._request_id += 1
         
         try:
             # Send request
-            request_json = json.dumps({
-                "jsonrpc": request.jsonrpc,
-                "id": request.id,
-                "method": request.method,
-                "params": request.params
-            }) + "\n"
+            request_line = orjson.dumps({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": method,
+                "params": params
+            }) + b"\n"
             
-            self.process.stdin.write(request_json)
-            self.process.stdin.flush()
+            # Responses are matched to requests by order, so concurrent callers
+            # must not interleave their write and read on the shared pipes
+            async with self._io_lock:
+                self.process.stdin.write(request_line)
+                await self.process.stdin.drain()
+                
+                # Read response without blocking the event loop
+                response_line = await self.process.stdout.readline()
             
-            # Read response
-            response_line = self.process.stdout.readline()
             if not response_line:
                 logger.error("No response from MCP server")
                 return None
             
-            response_data = json.loads(response_line.strip())
-            return MCPResponse(
-                jsonrpc=response_data.get("jsonrpc"),
-                id=response_data.get("id"),
-                result=response_data.get("result"),
-                error=response_data.get("error")
-            )
+            return orjson.loads(response_line)
             
         except Exception as e:
             logger.error(f"Error sending MCP request: {e}")
             return None
     
+    async def _cached_request(
+        self, key: str, method: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[Any]:
+        """Send a read-only request, serving repeats from the cache.
+        
+        Concurrent misses for the same key share a single request instead of
+        each hitting the server.
+        """
+        cached = self._cache.get(key, max_age_seconds=self._cache_ttl)
+        if cached is not None:
+            return cached
+        
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        result = None
+        try:
+            response = await self._send_request(method, params)
+            if response and response.get("result"):
+                result = response["result"]
+                self._cache.set(key, result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+            future.set_result(result)
+    
     async def _list_resources(self) -> None:
         """List available resources."""
-        request = MCPRequest(method="resources/list")
-        response = await self._send_request(request)
+        result = await self._cached_request("resources", "resources/list")
         
-        if response and response.result:
-            self._resources = response.result.get("resources", [])
+        if result:
+            self._resources = result.get("resources", [])
             logger.info(f"Available MCP resources: {len(self._resources)}")
     
     async def _list_tools(self) -> None:
         """List available tools."""
-        request = MCPRequest(method="tools/list")
-        response = await self._send_request(request)
+        result = await self._cached_request("tools", "tools/list")
         
-        if response and response.result:
-            self._tools = response.result.get("tools", [])
+        if result:
+            self._tools = result.get("tools", [])
             logger.info(f"Available MCP tools: {len(self._tools)}")
     
     async def get_resource(self, uri: str) -> Optional[Dict[str, Any]]:
         """Get resource content."""
-        request = MCPRequest(
-            method="resources/read",
-            params={"uri": uri}
-        )
-        
-        response = await self._send_request(request)
-        if response and response.result:
-            return response.result.get("contents", [{}])[0]
+        result = await self._cached_request(f"res:{uri}", "resources/read", {"uri": uri})
+        if result:
+            return result.get("contents", [{}])[0]
         
         return None
     
     async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """Call MCP tool."""
-        request = MCPRequest(
-            method="tools/call",
-            params={
+        response = await self._send_request(
+            "tools/call",
+            {
                 "name": name,
                 "arguments": arguments or {}
             }
         )
-        
-        response = await self._send_request(request)
-        if response and response.result:
-            return response.result
+        if response and response.get("result"):
+            return response["result"]
         
         return None
     
@@ -218,48 +247,49 @@ class MCPClient:
     
     def is_connected(self) -> bool:
         """Check if client is connected."""
-        return self._connected and self.process and self.process.poll() is None
+        return self._connected and self.process is not None and self.process.returncode is None
 
 
 class MCPCache:
     """Cache for MCP responses."""
     
-    def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._timestamps: Dict[str, datetime] = {}
+    def __init__(self, maxsize: int = CACHE_MAXSIZE):
+        # key -> (time.monotonic() when stored, value), kept in the order the
+        # entries were stored, so the front is always the oldest entry
+        self._store: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.maxsize = maxsize
     
     def get(self, key: str, max_age_seconds: int = 300) -> Optional[Any]:
         """Get cached value if not expired."""
-        if key not in self._cache:
+        entry = self._store.get(key)
+        if entry is None:
             return None
         
-        if key in self._timestamps:
-            age = datetime.utcnow() - self._timestamps[key]
-            if age.total_seconds() > max_age_seconds:
-                self._cache.pop(key, None)
-                self._timestamps.pop(key, None)
-                return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > max_age_seconds:
+            self._store.pop(key, None)
+            return None
         
-        return self._cache[key]
+        return value
     
     def set(self, key: str, value: Any) -> None:
-        """Set cached value."""
-        self._cache[key] = value
-        self._timestamps[key] = datetime.utcnow()
+        """Set cached value, evicting the oldest entries beyond maxsize."""
+        self._store.pop(key, None)
+        self._store[key] = (time.monotonic(), value)
+        while len(self._store) > self.maxsize:
+            self._store.popitem(last=False)
     
     def clear(self) -> None:
         """Clear all cached values."""
-        self._cache.clear()
-        self._timestamps.clear()
+        self._store.clear()
     
     def cleanup_expired(self, max_age_seconds: int = 300) -> None:
-        """Remove expired entries."""
-        now = datetime.utcnow()
-        expired_keys = [
-            key for key, timestamp in self._timestamps.items()
-            if (now - timestamp).total_seconds() > max_age_seconds
-        ]
+        """Remove expired entries.
         
-        for key in expired_keys:
-            self._cache.pop(key, None)
-            self._timestamps.pop(key, None)
+        Only the expired entries at the front are visited, so this is cheap
+        enough to call on every request.
+        """
+        cutoff = time.monotonic() - max_age_seconds
+        store = self._store
+        while store and next(iter(store.values()))[0] < cutoff:
+            store.popitem(last=False)
@@ -2,11 +2,15 @@
 
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Set
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Type
 from datetime import datetime, timedelta
 
-from sqlalchemy.orm import Session
-from contextvault.database import get_db_session
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import selectinload
+from contextvault.database import get_db_context
 from contextvault.models.mcp import MCPConnection, MCPProvider
 from .client import MCPClient, MCPCache
 from .providers import (
@@ -18,6 +22,45 @@ from .providers import (
 
 logger = logging.getLogger(__name__)
 
+# Seconds an enabled-providers lookup for a model is reused
+PROVIDER_CACHE_TTL = 60
+
+# Seconds a single provider may take before its contribution is skipped
+PROVIDER_TIMEOUT = 2.0
+
+# Consecutive timeouts after which a provider is skipped for the cooldown
+PROVIDER_FAILURE_THRESHOLD = 3
+PROVIDER_COOLDOWN_SECONDS = 30
+
+# Hot lookups built once; SQLAlchemy reuses their compiled form across calls
+_SELECT_ENABLED_PROVIDERS = select(
+    MCPProvider.id,
+    MCPProvider.inject_recent_activity,
+    MCPProvider.inject_scheduled_events,
+    MCPProvider.context_template,
+).join(MCPConnection).where(
+    MCPProvider.model_id == bindparam("model_id"),
+    MCPProvider.enabled == True,
+    MCPConnection.status == "active",
+)
+
+# Every enabled provider on an active connection, for warming the cache
+_SELECT_ALL_ENABLED_PROVIDERS = select(
+    MCPProvider.model_id,
+    MCPProvider.id,
+    MCPProvider.inject_recent_activity,
+    MCPProvider.inject_scheduled_events,
+    MCPProvider.context_template,
+).join(MCPConnection).where(
+    MCPProvider.enabled == True,
+    MCPConnection.status == "active",
+)
+
+_SELECT_PROVIDER = select(MCPProvider).where(
+    MCPProvider.connection_id == bindparam("connection_id"),
+    MCPProvider.model_id == bindparam("model_id"),
+)
+
 
 class MCPManager:
     """Manages MCP connections and providers."""
@@ -26,6 +69,13 @@ class MCPManager:
         self._clients: Dict[str, MCPClient] = {}
         self._providers: Dict[str, BaseMCPProvider] = {}
         self._caches: Dict[str, MCPCache] = {}
+        # model_id -> (time.monotonic() when loaded, [(enabled provider row,
+        # its live provider instance)]); dropped whenever _providers changes
+        self._provider_cache: Dict[str, Tuple[float, List[Tuple[Row, BaseMCPProvider]]]] = {}
+        # (provider_id, method, args) -> provider call already in flight
+        self._inflight: Dict[Tuple[str, str, Any], asyncio.Future] = {}
+        # provider_id -> (consecutive timeouts, time.monotonic() to skip until)
+        self._provider_timeouts: Dict[str, Tuple[int, float]] = {}
         self._provider_types = {
             "calendar": CalendarMCPProvider,
             "gmail": GmailMCPProvider,
@@ -38,31 +88,48 @@ class MCPManager:
         """Initialize MCP manager and connect to configured servers."""
         logger.info("Initializing MCP manager...")
         
-        db = next(get_db_session())
-        try:
-            # Get all active connections
-            connections = db.query(MCPConnection).filter(
-                MCPConnection.status == "active"
-            ).all()
-            
-            for connection in connections:
-                await self._connect_connection(connection)
-            
-            logger.info(f"MCP manager initialized with {len(self._clients)} connections")
-            
-        finally:
-            db.close()
+        # Get all active connections
+        connections = await asyncio.to_thread(self._load_active_connections)
+        
+        # Handshakes are independent, so overlap them instead of paying
+        # each connection's startup latency in turn
+        results = await asyncio.gather(
+            *(self._connect_connection(connection) for connection in connections),
+            return_exceptions=True,
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error connecting to MCP server {connection.name}: {result}")
+        
+        # Load every model's providers in one query so the first requests
+        # for each model are served from memory too
+        if self._providers:
+            await self._warm_provider_cache()
+        
+        logger.info(f"MCP manager initialized with {len(self._clients)} connections")
     
     async def shutdown(self) -> None:
         """Shutdown MCP manager and disconnect all clients."""
         logger.info("Shutting down MCP manager...")
         
-        for client in self._clients.values():
-            await client.disconnect()
+        # Abandon provider calls still running against the clients
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
+        
+        results = await asyncio.gather(
+            *(client.disconnect() for client in self._clients.values()),
+            return_exceptions=True,
+        )
+        for connection_id, result in zip(self._clients, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error disconnecting MCP client {connection_id}: {result}")
         
         self._clients.clear()
         self._providers.clear()
         self._caches.clear()
+        self._provider_cache.clear()
+        self._provider_timeouts.clear()
         
         logger.info("MCP manager shutdown complete")
     
@@ -74,11 +141,8 @@ class MCPManager:
         config: Optional[Dict[str, Any]] = None
     ) -> str:
         """Add a new MCP connection."""
-        import uuid
-        
         connection_id = str(uuid.uuid4())
         
-        db = next(get_db_session())
         try:
             # Create connection record
             connection = MCPConnection(
@@ -89,73 +153,45 @@ class MCPManager:
                 config=config or {},
                 status="connecting"
             )
-            
-            db.add(connection)
-            db.commit()
+            await asyncio.to_thread(self._save_connection, connection)
             
             # Try to connect
             success = await self._connect_connection(connection)
+            status = await asyncio.to_thread(self._record_connection_result, connection_id, success)
             
-            if success:
-                connection.status = "active"
-                connection.record_success()
-            else:
-                connection.status = "error"
-                connection.record_error("Failed to connect during setup")
-            
-            db.commit()
-            
-            logger.info(f"Added MCP connection {name} ({connection_id}): {connection.status}")
+            logger.info(f"Added MCP connection {name} ({connection_id}): {status}")
             return connection_id
             
         except Exception as e:
-            db.rollback()
             logger.error(f"Error adding MCP connection: {e}")
             raise
-        finally:
-            db.close()
     
     async def remove_connection(self, connection_id: str) -> bool:
         """Remove an MCP connection."""
-        db = next(get_db_session())
         try:
-            connection = db.query(MCPConnection).filter(
-                MCPConnection.id == connection_id
-            ).first()
-            
-            if not connection:
-                return False
-            
-            # Disconnect client
-            if connection_id in self._clients:
-                await self._clients[connection_id].disconnect()
-                del self._clients[connection_id]
-            
-            # Remove providers
-            provider_ids = [
-                p.id for p in connection.providers
-            ]
-            for provider_id in provider_ids:
-                if provider_id in self._providers:
-                    del self._providers[provider_id]
-            
-            # Remove cache
-            if connection_id in self._caches:
-                del self._caches[connection_id]
-            
-            # Remove from database
-            db.delete(connection)
-            db.commit()
-            
-            logger.info(f"Removed MCP connection {connection_id}")
-            return True
-            
+            provider_ids = await asyncio.to_thread(self._delete_connection, connection_id)
         except Exception as e:
-            db.rollback()
             logger.error(f"Error removing MCP connection: {e}")
             return False
-        finally:
-            db.close()
+        
+        if provider_ids is None:
+            return False
+        
+        # Disconnect client
+        if connection_id in self._clients:
+            await self._clients.pop(connection_id).disconnect()
+        
+        # Remove providers
+        for provider_id in provider_ids:
+            self._providers.pop(provider_id, None)
+            self._provider_timeouts.pop(provider_id, None)
+        
+        # Remove cache
+        self._caches.pop(connection_id, None)
+        self._provider_cache.clear()
+        
+        logger.info(f"Removed MCP connection {connection_id}")
+        return True
     
     async def enable_provider_for_model(
         self,
@@ -166,51 +202,73 @@ class MCPManager:
         allowed_tools: Optional[List[str]] = None
     ) -> bool:
         """Enable/disable MCP provider for specific model."""
-        import uuid
-        
-        db = next(get_db_session())
         try:
-            # Find existing provider
-            provider = db.query(MCPProvider).filter(
-                MCPProvider.connection_id == connection_id,
-                MCPProvider.model_id == model_id
-            ).first()
-            
-            if provider:
-                # Update existing
-                provider.enabled = enabled
-                if allowed_resources is not None:
-                    provider.allowed_resources = allowed_resources
-                if allowed_tools is not None:
-                    provider.allowed_tools = allowed_tools
-            else:
-                # Create new provider
-                provider = MCPProvider(
-                    id=str(uuid.uuid4()),
-                    connection_id=connection_id,
-                    model_id=model_id,
-                    enabled=enabled,
-                    allowed_resources=allowed_resources or [],
-                    allowed_tools=allowed_tools or []
-                )
-                db.add(provider)
-            
-            db.commit()
+            provider, provider_type = await asyncio.to_thread(
+                self._save_provider,
+                connection_id,
+                model_id,
+                enabled,
+                allowed_resources,
+                allowed_tools,
+            )
+            self._provider_cache.pop(model_id, None)
             
             # Update in-memory provider if it exists
             if provider.id in self._providers:
                 # Recreate provider with new settings
-                await self._create_provider(provider)
+                provider_class = self._resolve_provider_class(provider_type)
+                if provider_class:
+                    await self._create_provider(provider, provider_class)
             
             logger.info(f"Updated MCP provider for model {model_id}: enabled={enabled}")
             return True
             
         except Exception as e:
-            db.rollback()
             logger.error(f"Error updating MCP provider: {e}")
             return False
-        finally:
-            db.close()
+    
+    async def bulk_enable_providers(
+        self,
+        connection_id: str,
+        settings: List[Tuple[str, bool, Optional[List[str]], Optional[List[str]]]],
+    ) -> bool:
+        """
+        Enable/disable one connection's provider for many models at once.
+        
+        Args:
+            connection_id: MCP connection ID
+            settings: (model_id, enabled, allowed_resources, allowed_tools)
+                tuples; None for a list leaves it unchanged (or empty for a
+                new provider), as in enable_provider_for_model
+            
+        Returns:
+            True if every provider was saved, False otherwise
+        """
+        if not settings:
+            return True
+        
+        try:
+            providers, provider_type = await asyncio.to_thread(
+                self._save_providers_bulk, connection_id, settings
+            )
+            for model_id, *_ in settings:
+                self._provider_cache.pop(model_id, None)
+            
+            # Recreate the in-memory providers that already exist
+            existing = [provider for provider in providers if provider.id in self._providers]
+            provider_class = self._resolve_provider_class(provider_type) if existing else None
+            if provider_class:
+                await asyncio.gather(*(
+                    self._create_provider(provider, provider_class)
+                    for provider in existing
+                ))
+            
+            logger.info(f"Updated {len(settings)} MCP providers for connection {connection_id}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error updating MCP providers: {e}")
+            return False
     
     async def get_context_for_model(
         self,
@@ -219,51 +277,26 @@ class MCPManager:
         limit: int = 10
     ) -> str:
         """Get MCP context for specific model."""
-        context_parts = []
-        
         # Get enabled providers for this model
-        db = next(get_db_session())
-        try:
-            providers = db.query(MCPProvider).join(MCPConnection).filter(
-                MCPProvider.model_id == model_id,
-                MCPProvider.enabled == True,
-                MCPConnection.status == "active"
-            ).all()
-            
-            for provider in providers:
-                if provider.id in self._providers:
-                    mcp_provider = self._providers[provider.id]
-                    
-                    try:
-                        if context_type == "recent_activity":
-                            if provider.inject_recent_activity:
-                                data = await mcp_provider.get_recent_activity(limit)
-                                if data:
-                                    context = mcp_provider.format_context(
-                                        data, 
-                                        provider.context_template
-                                    )
-                                    if context:
-                                        context_parts.append(f"## {mcp_provider.provider_type.title()} Recent Activity\n{context}")
-                        
-                        elif context_type == "scheduled_events":
-                            if provider.inject_scheduled_events:
-                                data = await mcp_provider.get_scheduled_events(7)
-                                if data:
-                                    context = mcp_provider.format_context(
-                                        data, 
-                                        provider.context_template
-                                    )
-                                    if context:
-                                        context_parts.append(f"## {mcp_provider.provider_type.title()} Upcoming Events\n{context}")
-                        
-                    except Exception as e:
-                        logger.error(f"Error getting context from provider {provider.id}: {e}")
-            
-        finally:
-            db.close()
+        providers = await self._get_enabled_providers(model_id)
+        if not providers:
+            return ""
+        
+        # Query the providers concurrently; order of the output follows the
+        # provider order regardless of which answers first
+        sections = await asyncio.gather(*(
+            self._fetch_context(provider, mcp_provider, context_type, limit)
+            for provider, mcp_provider in providers
+        ))
         
-        return "\n\n".join(context_parts)
+        # Lay out header, body and separator pieces and join them once
+        chunks: List[str] = []
+        for section in sections:
+            if section:
+                chunks.extend((*section, "\n\n"))
+        if chunks:
+            chunks.pop()
+        return "".join(chunks)
     
     async def search_mcp_data(
         self,
@@ -275,39 +308,350 @@ class MCPManager:
         results = []
         
         # Get enabled providers for this model
-        db = next(get_db_session())
+        providers = await self._get_enabled_providers(model_id)
+        if not providers:
+            return results
+        
+        # Search the providers concurrently, taking matches as they arrive and
+        # cancelling the remaining searches once enough have been collected
+        tasks = [
+            asyncio.ensure_future(self._search_provider(provider, mcp_provider, query, limit))
+            for provider, mcp_provider in providers
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                results.extend(await next_done)
+                if len(results) >= limit:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        return results[:limit]
+    
+    async def _fetch_context(
+        self,
+        provider: Row,
+        mcp_provider: BaseMCPProvider,
+        context_type: str,
+        limit: int,
+    ) -> Optional[Tuple[str, str]]:
+        """Get one provider's context section as (header, body), if it has any."""
+        try:
+            if context_type == "recent_activity":
+                if provider.inject_recent_activity:
+                    data = await self._call_provider(
+                        (provider.id, "recent_activity", limit),
+                        lambda: mcp_provider.get_recent_activity(limit),
+                    )
+                    if data:
+                        context = mcp_provider.format_context(
+                            data, 
+                            provider.context_template
+                        )
+                        if context:
+                            return mcp_provider.recent_activity_header, context
+            
+            elif context_type == "scheduled_events":
+                if provider.inject_scheduled_events:
+                    data = await self._call_provider(
+                        (provider.id, "scheduled_events", 7),
+                        lambda: mcp_provider.get_scheduled_events(7),
+                    )
+                    if data:
+                        context = mcp_provider.format_context(
+                            data, 
+                            provider.context_template
+                        )
+                        if context:
+                            return mcp_provider.scheduled_events_header, context
+            
+        except Exception as e:
+            logger.error(f"Error getting context from provider {provider.id}: {e}")
+        
+        return None
+    
+    async def _search_provider(
+        self,
+        provider: Row,
+        mcp_provider: BaseMCPProvider,
+        query: str,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Search one provider, tagging each match with where it came from."""
         try:
-            providers = db.query(MCPProvider).join(MCPConnection).filter(
-                MCPProvider.model_id == model_id,
-                MCPProvider.enabled == True,
+            data = await self._call_provider(
+                (provider.id, "search", (query, limit)),
+                lambda: mcp_provider.search(query, limit),
+            ) or []
+            for item in data:
+                item['source'] = mcp_provider.provider_type
+                item['provider_id'] = provider.id
+            return data
+            
+        except Exception as e:
+            logger.error(f"Error searching provider {provider.id}: {e}")
+        
+        return []
+    
+    async def _warm_provider_cache(self) -> None:
+        """Fill the per-model provider cache for all models at once."""
+        rows = await asyncio.to_thread(self._load_all_enabled_providers)
+        
+        by_model: Dict[str, List[Tuple[Row, BaseMCPProvider]]] = {}
+        for row in rows:
+            mcp_provider = self._providers.get(row.id)
+            if mcp_provider is not None:
+                by_model.setdefault(row.model_id, []).append((row, mcp_provider))
+        
+        loaded_at = time.monotonic()
+        for model_id, providers in by_model.items():
+            self._provider_cache[model_id] = (loaded_at, providers)
+    
+    async def _call_provider(
+        self, key: Tuple[str, str, Any], call: Callable[[], Awaitable[Any]]
+    ) -> Optional[Any]:
+        """
+        Call a provider with a timeout, returning None if it is skipped.
+        
+        A provider that times out PROVIDER_FAILURE_THRESHOLD times in a row
+        is not called again for PROVIDER_COOLDOWN_SECONDS, so a dead server
+        doesn't cost every request the full timeout.
+        """
+        provider_id, method, _ = key
+        timeouts, skip_until = self._provider_timeouts.get(provider_id, (0, 0.0))
+        if skip_until > time.monotonic():
+            return None
+        
+        try:
+            result = await asyncio.wait_for(
+                self._coalesced(key, call), timeout=PROVIDER_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            timeouts += 1
+            if timeouts >= PROVIDER_FAILURE_THRESHOLD:
+                logger.warning(
+                    f"MCP provider {provider_id} timed out {timeouts} times in a row; "
+                    f"skipping it for {PROVIDER_COOLDOWN_SECONDS}s"
+                )
+                self._provider_timeouts[provider_id] = (0, time.monotonic() + PROVIDER_COOLDOWN_SECONDS)
+            else:
+                logger.warning(f"Timed out calling {method} on MCP provider {provider_id}")
+                self._provider_timeouts[provider_id] = (timeouts, 0.0)
+            return None
+        
+        self._provider_timeouts.pop(provider_id, None)
+        return result
+    
+    async def _coalesced(self, key: Tuple[str, str, Any], call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a provider call, sharing it with identical calls already in flight.
+        
+        The call runs as its own task and callers wait on it through
+        ``asyncio.shield``, so a caller that times out or is cancelled
+        doesn't abort the fetch for the others (and the provider still gets
+        to cache the result).
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+    
+    async def _get_enabled_providers(self, model_id: str) -> List[Tuple[Row, BaseMCPProvider]]:
+        """
+        Get a model's enabled providers paired with their live instances.
+        
+        Providers without a running instance are left out. The pairing is
+        resolved once per lookup and reused until it expires or the provider
+        registry changes, so the hot path needs no registry lookups.
+        """
+        # Without any running provider no row could be paired, so skip the
+        # query entirely (the common case when MCP isn't set up)
+        if not self._providers:
+            return []
+        
+        cached = self._provider_cache.get(model_id)
+        if cached is not None and time.monotonic() - cached[0] < PROVIDER_CACHE_TTL:
+            return cached[1]
+        
+        rows = await asyncio.to_thread(self._load_enabled_providers, model_id)
+        providers = [
+            (row, self._providers[row.id])
+            for row in rows
+            if row.id in self._providers
+        ]
+        self._provider_cache[model_id] = (time.monotonic(), providers)
+        return providers
+    
+    # Database access. These run in a worker thread via asyncio.to_thread so
+    # queries don't block the event loop; rows are expunged before the session
+    # closes and handed back as detached, fully loaded objects.
+    
+    @staticmethod
+    def _load_active_connections() -> List[MCPConnection]:
+        with get_db_context() as db:
+            connections = db.query(MCPConnection).options(
+                selectinload(MCPConnection.providers)
+            ).filter(
                 MCPConnection.status == "active"
             ).all()
+            db.expunge_all()
+            return connections
+    
+    @staticmethod
+    def _save_connection(connection: MCPConnection) -> None:
+        # merge() saves a copy, leaving the caller's object transient
+        with get_db_context() as db:
+            db.merge(connection)
+    
+    @staticmethod
+    def _record_connection_result(connection_id: str, success: bool) -> Optional[str]:
+        with get_db_context() as db:
+            connection = db.get(MCPConnection, connection_id)
+            if not connection:
+                return None
             
-            for provider in providers:
-                if provider.id in self._providers:
-                    mcp_provider = self._providers[provider.id]
-                    
-                    try:
-                        data = await mcp_provider.search(query, limit)
-                        for item in data:
-                            item['source'] = mcp_provider.provider_type
-                            item['provider_id'] = provider.id
-                        results.extend(data)
-                        
-                    except Exception as e:
-                        logger.error(f"Error searching provider {provider.id}: {e}")
+            if success:
+                connection.status = "active"
+                connection.record_success()
+            else:
+                connection.status = "error"
+                connection.record_error("Failed to connect during setup")
+            return connection.status
+    
+    @staticmethod
+    def _delete_connection(connection_id: str) -> Optional[List[str]]:
+        """Delete a connection row, returning its provider IDs (None if missing)."""
+        with get_db_context() as db:
+            connection = db.query(MCPConnection).options(
+                selectinload(MCPConnection.providers)
+            ).filter(
+                MCPConnection.id == connection_id
+            ).first()
             
-        finally:
-            db.close()
-        
-        return results[:limit]
+            if not connection:
+                return None
+            
+            provider_ids = [
+                p.id for p in connection.providers
+            ]
+            db.delete(connection)
+            return provider_ids
+    
+    @staticmethod
+    def _save_provider(
+        connection_id: str,
+        model_id: str,
+        enabled: bool,
+        allowed_resources: Optional[List[str]],
+        allowed_tools: Optional[List[str]],
+    ) -> Tuple[MCPProvider, str]:
+        """Create or update a provider row, returning it with its connection's type."""
+        with get_db_context() as db:
+            # Find existing provider
+            provider = db.execute(
+                _SELECT_PROVIDER,
+                {"connection_id": connection_id, "model_id": model_id},
+            ).scalars().first()
+            
+            if provider:
+                # Update existing
+                provider.enabled = enabled
+                if allowed_resources is not None:
+                    provider.allowed_resources = allowed_resources
+                if allowed_tools is not None:
+                    provider.allowed_tools = allowed_tools
+            else:
+                # Create new provider
+                provider = MCPProvider(
+                    id=str(uuid.uuid4()),
+                    connection_id=connection_id,
+                    model_id=model_id,
+                    enabled=enabled,
+                    allowed_resources=allowed_resources or [],
+                    allowed_tools=allowed_tools or []
+                )
+                db.add(provider)
+            
+            db.flush()
+            provider_type = provider.connection.provider_type
+            db.expunge_all()
+            return provider, provider_type
+    
+    @staticmethod
+    def _save_providers_bulk(
+        connection_id: str,
+        settings: List[Tuple[str, bool, Optional[List[str]], Optional[List[str]]]],
+    ) -> Tuple[List[Row], str]:
+        """Upsert many providers with one INSERT and one UPDATE executemany."""
+        with get_db_context() as db:
+            provider_type = db.execute(
+                select(MCPConnection.provider_type).where(MCPConnection.id == connection_id)
+            ).scalar_one()
+            
+            model_ids = [model_id for model_id, *_ in settings]
+            existing = dict(db.execute(
+                select(MCPProvider.model_id, MCPProvider.id).where(
+                    MCPProvider.connection_id == connection_id,
+                    MCPProvider.model_id.in_(model_ids),
+                )
+            ).all())
+            
+            new_rows = []
+            updates = []
+            for model_id, enabled, allowed_resources, allowed_tools in settings:
+                provider_id = existing.get(model_id)
+                if provider_id is None:
+                    new_rows.append({
+                        "id": str(uuid.uuid4()),
+                        "connection_id": connection_id,
+                        "model_id": model_id,
+                        "enabled": enabled,
+                        "allowed_resources": allowed_resources or [],
+                        "allowed_tools": allowed_tools or [],
+                    })
+                else:
+                    # Bulk UPDATE by primary key; each distinct key set is
+                    # one executemany batch
+                    values = {"id": provider_id, "enabled": enabled}
+                    if allowed_resources is not None:
+                        values["allowed_resources"] = allowed_resources
+                    if allowed_tools is not None:
+                        values["allowed_tools"] = allowed_tools
+                    updates.append(values)
+            
+            if new_rows:
+                db.execute(insert(MCPProvider), new_rows)
+            if updates:
+                db.execute(update(MCPProvider), updates)
+            
+            providers = db.execute(
+                select(MCPProvider.id, MCPProvider.connection_id, MCPProvider.model_id).where(
+                    MCPProvider.connection_id == connection_id,
+                    MCPProvider.model_id.in_(model_ids),
+                )
+            ).all()
+            return providers, provider_type
+    
+    @staticmethod
+    def _load_all_enabled_providers() -> List[Row]:
+        with get_db_context() as db:
+            return db.execute(_SELECT_ALL_ENABLED_PROVIDERS).all()
+    
+    @staticmethod
+    def _load_enabled_providers(model_id: str) -> List[Row]:
+        """Load the columns context injection needs for a model's enabled providers."""
+        with get_db_context() as db:
+            return db.execute(_SELECT_ENABLED_PROVIDERS, {"model_id": model_id}).all()
     
     async def _connect_connection(self, connection: MCPConnection) -> bool:
         """Connect to an MCP server."""
         try:
             # Create client
             client = MCPClient(
-                connection.connection_id,
+                connection.id,
                 connection.endpoint,
                 connection.config
             )
@@ -323,10 +667,12 @@ class MCPManager:
                 cache = MCPCache()
                 self._caches[connection.id] = cache
                 
-                # Create providers
+                # Create providers; the class is resolved once per connection
                 providers = connection.providers
-                for provider in providers:
-                    await self._create_provider(provider)
+                provider_class = self._resolve_provider_class(connection.provider_type) if providers else None
+                if provider_class:
+                    for provider in providers:
+                        await self._create_provider(provider, provider_class)
                 
                 logger.info(f"Connected to MCP server {connection.name}")
                 return True
@@ -338,23 +684,27 @@ class MCPManager:
             logger.error(f"Error connecting to MCP server {connection.name}: {e}")
             return False
     
-    async def _create_provider(self, provider: MCPProvider) -> None:
-        """Create MCP provider instance."""
+    def _resolve_provider_class(self, provider_type: str) -> Optional[Type[BaseMCPProvider]]:
+        """Get the provider class for a connection type (aliases included)."""
+        provider_class = self._provider_types.get(provider_type)
+        if not provider_class:
+            logger.warning(f"Unknown MCP provider type: {provider_type}")
+        return provider_class
+    
+    async def _create_provider(
+        self, provider: MCPProvider, provider_class: Type[BaseMCPProvider]
+    ) -> None:
+        """Create MCP provider instance of the given class."""
         if provider.connection_id not in self._clients:
             return
         
         client = self._clients[provider.connection_id]
         cache = self._caches[provider.connection_id]
         
-        # Get provider class
-        provider_class = self._provider_types.get(provider.connection.provider_type)
-        if not provider_class:
-            logger.warning(f"Unknown MCP provider type: {provider.connection.provider_type}")
-            return
-        
         # Create provider instance
         mcp_provider = provider_class(client, cache)
         self._providers[provider.id] = mcp_provider
+        self._provider_cache.pop(provider.model_id, None)
         
         logger.info(f"Created MCP provider {provider.id} for model {provider.model_id}")
     
@@ -368,16 +718,18 @@ class MCPManager:
         }
         
         for connection_id, client in self._clients.items():
+            # Checked live (the server process can exit at any time), once
+            connected = client.is_connected()
             connection_status = {
                 "id": connection_id,
-                "connected": client.is_connected(),
+                "connected": connected,
                 "capabilities": client.get_capabilities(),
                 "resources": len(client.get_resources()),
                 "tools": len(client.get_tools())
             }
             status["connections"].append(connection_status)
             
-            if client.is_connected():
+            if connected:
                 status["active_connections"] += 1
         
         return status
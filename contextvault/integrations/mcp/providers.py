@@ -2,6 +2,7 @@
 
 import logging
 from abc import ABC, abstractmethod
+from functools import cached_property
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
 
@@ -18,6 +19,16 @@ class BaseMCPProvider(ABC):
         self.cache = cache
         self.provider_type = "base"
     
+    @cached_property
+    def recent_activity_header(self) -> str:
+        """Section header for this provider's recent activity context."""
+        return f"## {self.provider_type.title()} Recent Activity\n"
+    
+    @cached_property
+    def scheduled_events_header(self) -> str:
+        """Section header for this provider's upcoming events context."""
+        return f"## {self.provider_type.title()} Upcoming Events\n"
+    
     @abstractmethod
     async def get_recent_activity(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent activity/events."""
@@ -66,7 +77,7 @@ class CalendarMCPProvider(BaseMCPProvider):
         """Get recent calendar events."""
         cache_key = f"calendar_recent_{limit}"
         cached = self.cache.get(cache_key, max_age_seconds=300)
-        if cached:
+        if cached is not None:
             return cached
         
         try:
@@ -98,7 +109,7 @@ class CalendarMCPProvider(BaseMCPProvider):
         """Get upcoming calendar events."""
         cache_key = f"calendar_upcoming_{days_ahead}"
         cached = self.cache.get(cache_key, max_age_seconds=600)
-        if cached:
+        if cached is not None:
             return cached
         
         try:
@@ -133,7 +144,7 @@ class CalendarMCPProvider(BaseMCPProvider):
         """Search calendar events."""
         cache_key = f"calendar_search_{query}_{limit}"
         cached = self.cache.get(cache_key, max_age_seconds=600)
-        if cached:
+        if cached is not None:
             return cached
         
         try:
@@ -213,7 +224,7 @@ class GmailMCPProvider(BaseMCPProvider):
         """Get recent emails."""
         cache_key = f"gmail_recent_{limit}"
         cached = self.cache.get(cache_key, max_age_seconds=300)
-        if cached:
+        if cached is not None:
             return cached
         
         try:
@@ -243,7 +254,7 @@ class GmailMCPProvider(BaseMCPProvider):
         """Get emails with upcoming deadlines or appointments."""
         cache_key = f"gmail_upcoming_{days_ahead}"
         cached = self.cache.get(cache_key, max_age_seconds=600)
-        if cached:
+        if cached is not None:
             return cached
         
         try:
@@ -276,7 +287,7 @@ class GmailMCPProvider(BaseMCPProvider):
         """Search emails."""
         cache_key = f"gmail_search_{query}_{limit}"
         cached = self.cache.get(cache_key, max_age_seconds=600)
-        if cached:
+        if cached is not None:
             return cached
         
         try:
@@ -355,7 +366,7 @@ class FilesystemMCPProvider(BaseMCPProvider):
         """Get recently modified files."""
         cache_key = f"filesystem_recent_{limit}"
         cached = self.cache.get(cache_key, max_age_seconds=300)
-        if cached:
+        if cached is not None:
             return cached
         
         try:
@@ -389,7 +400,7 @@ class FilesystemMCPProvider(BaseMCPProvider):
         """Get files with upcoming deadlines (based on filename patterns)."""
         cache_key = f"filesystem_upcoming_{days_ahead}"
         cached = self.cache.get(cache_key, max_age_seconds=600)
-        if cached:
+        if cached is not None:
             return cached
         
         try:
@@ -422,7 +433,7 @@ class FilesystemMCPProvider(BaseMCPProvider):
         """Search files."""
         cache_key = f"filesystem_search_{query}_{limit}"
         cached = self.cache.get(cache_key, max_age_seconds=600)
-        if cached:
+        if cached is not None:
             return cached
         
         try:
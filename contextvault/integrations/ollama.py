@@ -4,7 +4,10 @@ import json
 import logging
 from typing import Any, Dict, List, Optional
 
+import httpx
+
 from .base import BaseIntegration
+from ..database import get_db_context
 from ..models import Session as SessionModel
 from ..services import context_retrieval_service
 from ..config import settings
@@ -67,7 +70,6 @@ class OllamaIntegration(BaseIntegration):
             )
 
             # Get relevant context with session management
-            from ..database import get_db_context
             from ..services.context_retrieval import ContextRetrievalService
 
             with get_db_context() as db:
@@ -229,8 +231,6 @@ class OllamaIntegration(BaseIntegration):
     async def check_model_availability(self, model_id: str) -> bool:
         """Check if a model is available in Ollama."""
         try:
-            import httpx
-            
             async with httpx.AsyncClient(timeout=5.0) as client:
                 response = await client.get(f"{self.endpoint}/api/tags")
                 
@@ -252,8 +252,6 @@ class OllamaIntegration(BaseIntegration):
     async def get_available_models(self) -> List[Dict[str, Any]]:
         """Get list of available models from Ollama."""
         try:
-            import httpx
-            
             async with httpx.AsyncClient(timeout=10.0) as client:
                 response = await client.get(f"{self.endpoint}/api/tags")
                 
@@ -325,8 +323,6 @@ class OllamaIntegration(BaseIntegration):
             Dictionary with operation status
         """
         try:
-            import httpx
-            
             async with httpx.AsyncClient(timeout=300.0) as client:  # Long timeout for model pulls
                 response = await client.post(
                     f"{self.endpoint}/api/pull",
@@ -376,8 +372,6 @@ class OllamaIntegration(BaseIntegration):
             Dictionary with response and metadata
         """
         try:
-            import httpx
-
             # Prepare request
             request_data = {
                 "model": model_id,
@@ -446,8 +440,6 @@ class OllamaIntegration(BaseIntegration):
             Dictionary with response and metadata
         """
         try:
-            import httpx
-
             # Prepare request
             request_data = {
                 "model": model_id,
@@ -129,6 +129,11 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down ContextVault application")
+    
+    # Persist queued proxy sessions, then release pooled connections
+    from .integrations import flush_sessions, ollama_integration
+    await flush_sessions()
+    await ollama_integration.aclose()
 
 
 # Create FastAPI application
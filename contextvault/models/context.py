@@ -5,7 +5,7 @@ import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import JSON, DateTime, Enum, String, Text, func, LargeBinary
+from sqlalchemy import JSON, DateTime, Enum, Index, String, Text, func, LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..database import Base
@@ -127,6 +127,12 @@ class ContextEntry(Base):
         comment="Semantic embedding vector for similarity search (pickled numpy array)"
     )
     
+    # Indexes for newest-first listings and per-type counts
+    __table_args__ = (
+        Index("ix_context_entries_created_at", "created_at"),
+        Index("ix_context_entries_context_type", "context_type"),
+    )
+    
     def __repr__(self) -> str:
         """String representation of the context entry."""
         return (
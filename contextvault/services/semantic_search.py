@@ -44,6 +44,9 @@ from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Rows hydrated per batch when a search scans every context entry
+SCAN_BATCH_SIZE = 500
+
 
 class SemanticSearchService:
     """Handles semantic search for context entries using sentence transformers."""
@@ -341,11 +344,8 @@ class SemanticSearchService:
             # Ensure embeddings are up to date
             self.update_context_embeddings(db_session)
             
-            # Get all context entries
-            all_entries = db_session.query(ContextEntry).all()
-            
-            if not all_entries:
-                return []
+            # Stream context entries in batches rather than loading the whole table
+            all_entries = db_session.query(ContextEntry).yield_per(SCAN_BATCH_SIZE)
             
             # Calculate similarities
             similarities = []
@@ -386,12 +386,8 @@ class SemanticSearchService:
         similarity_threshold = similarity_threshold or 0.05  # Lower threshold for keyword search
         
         try:
-            # Get all context entries
-            all_entries = db_session.query(ContextEntry).all()
-            
-            if not all_entries:
-                logger.info("No context entries found for keyword search")
-                return []
+            # Stream context entries in batches rather than loading the whole table
+            all_entries = db_session.query(ContextEntry).yield_per(SCAN_BATCH_SIZE)
             
             # Simple keyword-based search
             query_words = set(re.findall(r'\b\w+\b', query.lower()))
@@ -431,14 +427,14 @@ class SemanticSearchService:
                     if any(keyword in query.lower() for keyword in personal_keywords) and any(keyword in entry.content.lower() for keyword in ['i am', 'i have', 'i live', 'i drive', 'my']):
                         similarity += 0.2
                     
-                    results.append((entry, min(similarity, 1.0)))
+                    # Only entries above the threshold are kept alive
+                    similarity = min(similarity, 1.0)
+                    if similarity > similarity_threshold:
+                        results.append((entry, similarity))
             
             # Sort by similarity (descending)
             results.sort(key=lambda x: x[1], reverse=True)
             
-            # Filter by threshold
-            results = [r for r in results if r[1] > similarity_threshold]
-            
             logger.info(f"Keyword search found {len(results)} results above threshold {similarity_threshold}")
             return results[:max_results]
             
@@ -1,8 +1,8 @@
 """Token counting service with support for multiple tokenizer types."""
 
 import logging
-from typing import Optional, Union, List
-from functools import lru_cache
+from typing import Callable, Optional, Union, List
+from functools import lru_cache, partial
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +82,43 @@ class TokenCounter:
 
         return None
 
+    @lru_cache(maxsize=8)
+    def get_counter(self, tokenizer_type: str = "llama") -> Callable[[str], int]:
+        """
+        Get a token counting function bound to a resolved tokenizer (cached).
+
+        Callers that count many texts with the same tokenizer can hold on to
+        the returned function and skip the per-call lookup and dispatch.
+
+        Args:
+            tokenizer_type: Type of tokenizer to use
+
+        Returns:
+            Function mapping a text string to its token count
+        """
+        tokenizer = self._get_tokenizer(tokenizer_type)
+
+        if not tokenizer:
+            return lambda text: self._estimate_tokens(text) if text else 0
+
+        if tokenizer_type == "gpt":
+            # tiktoken
+            encode = tokenizer.encode
+        else:
+            # HuggingFace
+            encode = partial(tokenizer.encode, add_special_tokens=True)
+
+        def count(text: str) -> int:
+            if not text:
+                return 0
+            try:
+                return len(encode(text))
+            except Exception as e:
+                logger.warning(f"Token counting failed, using estimation: {e}")
+                return self._estimate_tokens(text)
+
+        return count
+
     def count_tokens(
         self,
         text: Union[str, List[str]],
@@ -106,23 +143,11 @@ class TokenCounter:
         if isinstance(text, list):
             text = "\n\n".join(text)
 
-        # Try actual tokenizer first
-        if not use_estimation:
-            tokenizer = self._get_tokenizer(tokenizer_type)
-
-            if tokenizer:
-                try:
-                    if tokenizer_type == "gpt":
-                        # tiktoken
-                        return len(tokenizer.encode(text))
-                    else:
-                        # HuggingFace
-                        return len(tokenizer.encode(text, add_special_tokens=True))
-                except Exception as e:
-                    logger.warning(f"Token counting failed, using estimation: {e}")
+        if use_estimation:
+            return self._estimate_tokens(text)
 
-        # Fallback to character-based estimation
-        return self._estimate_tokens(text)
+        # Actual tokenizer, falling back to estimation if unavailable
+        return self.get_counter(tokenizer_type)(text)
 
     def _estimate_tokens(self, text: str) -> int:
         """
@@ -161,16 +186,34 @@ class TokenCounter:
         tokenizer_type: str = "llama"
     ) -> List[int]:
         """
-        Count tokens for multiple texts efficiently.
+        Count tokens for multiple texts with a single tokenizer call.
 
         Args:
             texts: List of text strings
             tokenizer_type: Type of tokenizer to use
 
         Returns:
-            List of token counts
+            List of token counts (same order as texts)
         """
-        return [self.count_tokens(text, tokenizer_type) for text in texts]
+        if not texts:
+            return []
+
+        tokenizer = self._get_tokenizer(tokenizer_type)
+
+        if tokenizer:
+            try:
+                if tokenizer_type == "gpt":
+                    # tiktoken
+                    encoded = tokenizer.encode_batch(list(texts))
+                else:
+                    # HuggingFace
+                    encoded = tokenizer(list(texts), add_special_tokens=True)["input_ids"]
+                return [len(ids) if text else 0 for text, ids in zip(texts, encoded)]
+            except Exception as e:
+                logger.warning(f"Batch token counting failed, using estimation: {e}")
+
+        # Fallback to character-based estimation
+        return [self._estimate_tokens(text) if text else 0 for text in texts]
 
     def fits_in_window(
         self,
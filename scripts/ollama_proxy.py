@@ -11,7 +11,7 @@ from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import StreamingResponse, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # Add the parent directory to Python path so we can import contextvault
@@ -19,7 +19,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from contextvault.config import settings, validate_environment
 from contextvault.database import check_database_connection, init_database
-from contextvault.integrations import ollama_integration
+from contextvault.integrations import flush_sessions, ollama_integration
 from contextvault.api import context as context_router
 from contextvault.api import permissions as permissions_router
 from contextvault.api import mcp as mcp_router
@@ -60,6 +60,10 @@ async def lifespan(app: FastAPI):
     logger.info("ContextVault Ollama Proxy started successfully")
     yield
     logger.info("ContextVault Ollama Proxy shutting down")
+    
+    # Persist queued proxy sessions, then release pooled connections
+    await flush_sessions()
+    await ollama_integration.aclose()
 
 # Create FastAPI app for the proxy
 app = FastAPI(
@@ -177,12 +181,13 @@ async def generate_with_context(request: Request):
             headers=headers,
             body=body,
             inject_context=True,
+            stream=True,
         )
         
-        return Response(
-            content=result["content"],
+        return StreamingResponse(
+            result["stream"],
             status_code=result["status_code"],
-            headers=dict(result["headers"]),
+            headers=result["headers"],
         )
         
     except Exception as e:
@@ -204,12 +209,13 @@ async def chat_with_context(request: Request):
             headers=headers,
             body=body,
             inject_context=True,
+            stream=True,
         )
 
-        return Response(
-            content=result["content"],
+        return StreamingResponse(
+            result["stream"],
             status_code=result["status_code"],
-            headers=dict(result["headers"]),
+            headers=result["headers"],
         )
 
     except Exception as e:
@@ -252,12 +258,13 @@ async def proxy_all_other_requests(request: Request, path: str):
             headers=headers,
             body=body,
             inject_context=False,
+            stream=True,
         )
         
-        return Response(
-            content=result["content"],
+        return StreamingResponse(
+            result["stream"],
             status_code=result["status_code"],
-            headers=dict(result["headers"]),
+            headers=result["headers"],
         )
         
     except Exception as e:
@@ -109,6 +109,36 @@ class TestMemoryBuffer:
         # Buffer should have evicted some items to stay under limit
         assert buffer.current_tokens <= buffer.max_tokens
 
+    def test_lru_eviction_respects_access(self):
+        """Test that accessing an item protects it from LRU eviction."""
+        buffer = MemoryBuffer("test_buffer", max_tokens=30, eviction_strategy="lru")
+
+        for i in range(3):
+            buffer.add(MemoryItem(id=f"item-{i}", content=f"Content {i}", tokens=10))
+
+        buffer.get("item-0")
+        buffer.add(MemoryItem(id="new", content="New content", tokens=10))
+
+        ids = [item.id for item in buffer.items]
+        assert "item-0" in ids
+        assert "item-1" not in ids
+
+    def test_priority_eviction(self):
+        """Test that priority eviction removes the lowest-scored item."""
+        buffer = MemoryBuffer("test_buffer", max_tokens=30, eviction_strategy="priority")
+
+        for i, weight in enumerate([0.5, 0.1, 0.9]):
+            buffer.add(MemoryItem(
+                id=f"item-{i}", content=f"Content {i}", tokens=10, attention_weight=weight
+            ))
+
+        buffer.add(MemoryItem(id="new", content="New content", tokens=10, attention_weight=0.6))
+
+        ids = [item.id for item in buffer.items]
+        assert "item-1" not in ids
+        assert len(ids) == 3
+        assert buffer.current_tokens == 30
+
     def test_item_too_large(self):
         """Test that items larger than buffer are rejected."""
         buffer = MemoryBuffer("test_buffer", max_tokens=50)
@@ -121,6 +151,19 @@ class TestMemoryBuffer:
         success = buffer.add(large_item)
         assert success is False
 
+    def test_add_many(self):
+        """Test adding several items at once."""
+        buffer = MemoryBuffer("test_buffer", max_tokens=50)
+
+        items = [MemoryItem(id=f"item-{i}", content=f"Content {i}") for i in range(3)]
+        items.append(MemoryItem(id="large", content="Too large for this buffer " * 20))
+
+        rejected = buffer.add_many(items)
+
+        assert [item.id for item in rejected] == ["large"]
+        assert len(buffer.items) == 3
+        assert buffer.current_tokens == sum(item.tokens for item in items[:3])
+
     def test_get_item(self):
         """Test retrieving items from buffer."""
         buffer = MemoryBuffer("test_buffer", max_tokens=1000)
@@ -315,6 +358,25 @@ class TestCognitiveWorkspace:
         # Low attention should be in episodic cache or task buffer
         assert "low" in episodic_ids or "low" in task_buffer_ids
 
+    def test_scratchpad_overflow_spills_to_task_buffer(self):
+        """Test that high-attention items beyond scratchpad capacity spill over."""
+        workspace = CognitiveWorkspace(scratchpad_tokens=100)
+
+        items = [
+            MemoryItem(id=f"high-{i}", content=f"High {i}", tokens=30, attention_weight=0.9 - i * 0.01)
+            for i in range(5)
+        ]
+
+        workspace._distribute_to_buffers("Test query", items)
+
+        scratchpad_ids = [item.id for item in workspace.scratchpad.items]
+        task_buffer_ids = [item.id for item in workspace.task_buffer.items]
+
+        assert "high-0" in scratchpad_ids
+        assert "high-4" in task_buffer_ids
+        assert workspace.scratchpad.current_tokens <= workspace.scratchpad.max_tokens
+        assert len(scratchpad_ids) + len(task_buffer_ids) == 6  # Items plus the query
+
     def test_workspace_statistics(self):
         """Test getting workspace statistics."""
         workspace = CognitiveWorkspace()
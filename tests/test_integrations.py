@@ -235,7 +235,8 @@ class TestOllamaIntegration:
             mock_response = Mock()
             mock_response.status_code = 200
             
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.is_closed = False
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
             
             health = await integration.health_check()
             
@@ -250,7 +251,8 @@ class TestOllamaIntegration:
         
         # Mock connection error
         with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(
+            mock_client.return_value.is_closed = False
+            mock_client.return_value.get = AsyncMock(
                 side_effect=Exception("Connection refused")
             )
             
@@ -261,6 +263,110 @@ class TestOllamaIntegration:
             assert health["available"] is False
             assert "error" in health
     
+    @pytest.mark.asyncio
+    async def test_http_client_reused_between_requests(self):
+        """Test that health checks share one keep-alive client."""
+        integration = OllamaIntegration()
+        
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_response = Mock()
+            mock_response.status_code = 200
+            
+            mock_client.return_value.is_closed = False
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
+            mock_client.return_value.aclose = AsyncMock()
+            
+            await integration.health_check()
+            await integration.health_check()
+            assert mock_client.call_count == 1
+            
+            await integration.aclose()
+            mock_client.return_value.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_proxy_request_normalizes_headers(self):
+        """Test that proxied headers are copied and client-managed ones dropped."""
+        integration = OllamaIntegration()
+        headers = {"Host": "localhost:11435", "Content-Length": "2", "X-Trace": "abc"}
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_response = Mock()
+            mock_response.status_code = 404
+            mock_response.headers = {}
+            mock_response.content = b""
+
+            mock_client.return_value.is_closed = False
+            mock_client.return_value.request = AsyncMock(return_value=mock_response)
+
+            await integration.proxy_request(
+                path="/api/tags",
+                method="GET",
+                headers=headers,
+                body=b"{}",
+                inject_context=False,
+            )
+
+            sent = mock_client.return_value.request.call_args.kwargs["headers"]
+            assert sent == {"x-trace": "abc"}
+            assert "Content-Length" in headers
+
+    @pytest.mark.asyncio
+    async def test_proxy_request_streams_response(self):
+        """Test that streamed proxy responses are relayed chunk by chunk."""
+        integration = OllamaIntegration()
+
+        async def chunks(chunk_size=None):
+            yield b'{"response": "Hel"}\n'
+            yield b'{"response": "lo"}\n'
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.headers = {"Content-Type": "application/x-ndjson", "Content-Length": "38"}
+            mock_response.aiter_bytes = chunks
+            mock_response.aclose = AsyncMock()
+
+            mock_client.return_value.is_closed = False
+            mock_client.return_value.send = AsyncMock(return_value=mock_response)
+
+            result = await integration.proxy_request(
+                path="/api/tags",
+                method="GET",
+                headers={},
+                inject_context=False,
+                stream=True,
+            )
+
+            assert result["status_code"] == 200
+            assert result["headers"] == {"Content-Type": "application/x-ndjson"}
+            received = [chunk async for chunk in result["stream"]]
+            assert received == [b'{"response": "Hel"}\n', b'{"response": "lo"}\n']
+            mock_response.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_relay_response_client_disconnect_fails_session(self):
+        """Test that a stream closed before the end is not recorded as a success."""
+        integration = OllamaIntegration()
+
+        async def chunks(chunk_size=None):
+            yield b'{"response": "Hel"}\n'
+            yield b'{"response": "lo"}\n'
+
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.aiter_bytes = chunks
+        mock_response.aclose = AsyncMock()
+        session = Mock()
+
+        with patch('contextvault.integrations.base._session_writer') as mock_writer:
+            stream = integration._relay_response(mock_response, None, "llama2", session, None)
+            assert await stream.__anext__() == b'{"response": "Hel"}\n'
+            await stream.aclose()
+
+        mock_response.aclose.assert_awaited_once()
+        session.complete_session.assert_called_once_with(success=False, error_message="client disconnected")
+        mock_writer.submit.assert_called_once_with(session)
+
     @pytest.mark.asyncio
     async def test_check_model_availability(self):
         """Test checking if a model is available."""
@@ -440,6 +546,14 @@ class TestBaseIntegration:
         )
         
         # Should not raise any exceptions
+    
+    def test_peek_model_id(self):
+        """Test reading the model from a raw body without parsing it."""
+        integration = OllamaIntegration()
+        
+        assert integration.peek_model_id(b'{"model": "llama2:latest", "prompt": "hi"}') == "llama2:latest"
+        assert integration.peek_model_id(b'{"prompt": "hi", "model" : "mistral"}') == "mistral"
+        assert integration.peek_model_id(b'{"prompt": "hi"}') is None
 
 
 if __name__ == "__main__":